@@ -1,28 +1,48 @@
 import boto3
 import os
+from functools import lru_cache
+from botocore.config import Config
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Pooled keep-alive connections with adaptive retries, shared by every call
+S3_CONFIG = Config(
+    max_pool_connections=50,
+    retries={"max_attempts": 10, "mode": "adaptive"},
+    tcp_keepalive=True
+)
+
+@lru_cache(maxsize=None)
+def get_s3_client(region, access_key_id, secret_access_key):
+    """Builds one S3 client per credential set and reuses it for the process lifetime."""
+    return boto3.client(
+        "s3",
+        aws_access_key_id=access_key_id,
+        aws_secret_access_key=secret_access_key,
+        region_name=region,
+        config=S3_CONFIG
+    )
+
 def list_all_buckets():
     print("🔍 Fetching all S3 buckets...")
     try:
-        s3 = boto3.client(
-            "s3",
-            aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-            aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-            region_name=os.getenv("AWS_REGION")
+        s3 = get_s3_client(
+            os.getenv("AWS_REGION"),
+            os.getenv("AWS_ACCESS_KEY_ID"),
+            os.getenv("AWS_SECRET_ACCESS_KEY")
         )
-        response = s3.list_buckets()
-        buckets = [bucket["Name"] for bucket in response.get("Buckets", [])]
-        
+        buckets = []
+        for page in s3.get_paginator("list_buckets").paginate():
+            buckets.extend(bucket["Name"] for bucket in page.get("Buckets", []))
+
         if not buckets:
             print("❌ No buckets found in this account.")
         else:
             print(f"✅ Found {len(buckets)} buckets:")
             for b in buckets:
                 print(f" - {b}")
-                
+
     except Exception as e:
         print(f"❌ Failed to list buckets: {e}")
 
@@ -1,12 +1,21 @@
 import os
+from functools import lru_cache
 from typing import Dict, Any
 
-def load_config_from_env() -> Dict[str, Any]:
+def load_config_from_env(reload: bool = False) -> Dict[str, Any]:
     """
     Load configuration from environment variables.
-    Returns a dictionary with keys expected by connectors.
+    Returns a dictionary with keys expected by connectors; unset variables are omitted.
+    The environment is read once per process unless reload=True.
     """
-    return {
+    if reload:
+        _load.cache_clear()
+    # Connectors may mutate their config, so never hand out the cached dict itself
+    return dict(_load())
+
+@lru_cache(maxsize=1)
+def _load() -> Dict[str, Any]:
+    raw = {
         "aws_access_key_id": os.getenv("AWS_ACCESS_KEY_ID"),
         "aws_secret_access_key": os.getenv("AWS_SECRET_ACCESS_KEY"),
         "region": os.getenv("AWS_REGION"),
@@ -25,9 +34,11 @@ def load_config_from_env() -> Dict[str, Any]:
         "azure_client_secret": os.getenv("AZURE_CLIENT_SECRET"),
         "azure_resource_group": os.getenv("AZURE_RESOURCE_GROUP"),
         "azure_account_name": os.getenv("AZURE_ACCOUNT_NAME"),
+        "azure_max_concurrency": os.getenv("AZURE_MAX_CONCURRENCY"),
         "databricks_host": os.getenv("DATABRICKS_HOST"),
         "databricks_token": os.getenv("DATABRICKS_TOKEN"),
         "databricks_catalog": os.getenv("DATABRICKS_CATALOG"),
         "databricks_schema": os.getenv("DATABRICKS_SCHEMA"),
         "databricks_volume": os.getenv("DATABRICKS_VOLUME"),
     }
+    return {k: v for k, v in raw.items() if v is not None}
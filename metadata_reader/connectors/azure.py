@@ -1,71 +1,325 @@
-from azure.storage.blob import BlobServiceClient
-from azure.storage.filedatalake import DataLakeServiceClient
-from azure.mgmt.storage import StorageManagementClient
-from azure.mgmt.authorization import AuthorizationManagementClient
-from azure.identity import DefaultAzureCredential, ClientSecretCredential
-import requests
-from typing import List, Dict, Any
-from .base import BaseConnector
+# Azure SDK modules are imported where they are first needed; they are slow to load
+import functools
+import hashlib
+import itertools
+import json
+import logging
+import re
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Any, Iterator, Tuple
+from .base import BaseConnector, prefetch
 from ..models.metadata import FileMetadata
 
+logger = logging.getLogger(__name__)
+
+# Upper bound on containers listed concurrently during discovery (across all accounts)
+MAX_CONTAINER_WORKERS = 8
+# Upper bound on accounts whose metadata is prefetched concurrently during discovery
+MAX_ACCOUNT_WORKERS = 16
+# Largest page the Blob service returns per list request
+LIST_PAGE_SIZE = 5000
+# Keep-alive pool shared by every blob/DataLake client of a connector
+HTTP_POOL_CONNECTIONS = 50
+HTTP_POOL_MAXSIZE = 200
+# Container/blob clients memoized per connector for read_file/get_metadata lookups
+CLIENT_CACHE_SIZE = 1024
+# Seconds before expiry at which a cached AAD token is refreshed
+TOKEN_REFRESH_MARGIN = 300
+# Default parallel range GETs used by read_file (overridable with azure_max_concurrency)
+READ_CONCURRENCY = 8
+# Size of each ranged GET after the first; the SDK default is 4 MiB, set explicitly so it stays pinned
+MAX_CHUNK_GET_SIZE = 4 * 1024 * 1024
+# Listing pages fetched ahead of the one being processed
+PREFETCH_PAGES = 2
+
+# Error codes of a listing refused for its include options (besides a plain 403)
+AUTHORIZATION_ERROR_CODES = ("AuthorizationPermissionMismatch", "AuthorizationFailure")
+
+# Config keys identifying a connector's credentials; connectors agreeing on all of them share a transport and token cache
+CREDENTIAL_KEYS = ("connection_string", "azure_client_id", "azure_client_secret", "azure_tenant_id")
+
+# Characters that start a glob construct; everything before the first one is a literal name prefix
+GLOB_CHARS = "*?["
+
+def _extract_literal_prefix(pattern: str) -> str:
+    """Returns the part of a glob pattern before its first wildcard, usable as name_starts_with."""
+    for i, ch in enumerate(pattern):
+        if ch in GLOB_CHARS:
+            return pattern[:i]
+    return pattern
+
+@functools.lru_cache(maxsize=128)
+def _compile_glob(pattern: str) -> "re.Pattern":
+    """
+    Compiles a path glob over '/'-separated blob names: '*' and '?' stay within one segment,
+    '**' spans segments ('a/**/b' also matches 'a/b') and '[...]' / '[!...]' are character classes.
+    """
+    parts = []
+    i, n = 0, len(pattern)
+    while i < n:
+        ch = pattern[i]
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+            continue
+        if ch == "*":
+            parts.append("[^/]*")
+        elif ch == "?":
+            parts.append("[^/]")
+        elif ch == "[":
+            negate = pattern.startswith("[!", i)
+            start = i + 2 if negate else i + 1
+            # A ']' right after the opening bracket is a member, as in fnmatch
+            end = pattern.find("]", start + 1)
+            if end < 0:
+                parts.append(re.escape(ch))
+            else:
+                body = re.sub(r"([\\\[\]^])", r"\\\1", pattern[start:end])
+                parts.append(("[^/" if negate else "[") + body + "]")
+                i = end + 1
+                continue
+        else:
+            parts.append(re.escape(ch))
+        i += 1
+    return re.compile("".join(parts), re.DOTALL)
+
+def _is_authorization_denial(error: Exception) -> bool:
+    """Whether a failed request was refused for lack of permission, rather than failing transiently or for a missing resource."""
+    from azure.core.exceptions import HttpResponseError
+    if not isinstance(error, HttpResponseError):
+        return False
+    return error.status_code == 403 or getattr(error, "error_code", None) in AUTHORIZATION_ERROR_CODES
+
+def _prefetch_pages(items: Any, depth: int = PREFETCH_PAGES) -> Iterator[Any]:
+    """Yields listing items while a background thread fetches the following pages (at most depth ahead)."""
+    pages = items.by_page() if hasattr(items, "by_page") else iter((items,))
+    # Draining each page in the producer is what issues its request
+    prefetched = prefetch((list(page) for page in pages), depth)
+    try:
+        for page in prefetched:
+            yield from page
+    finally:
+        # Stop the background paging as soon as the caller stops iterating
+        prefetched.close()
+
+class _SharedClients:
+    """HTTP transport and credential shared by the live connectors built from the same credentials."""
+    def __init__(self, transport: Any, credential: Any):
+        self.transport = transport
+        self.credential = credential
+
+# Credential digest -> shared clients; an entry goes away with the last connector holding it
+_shared_clients: "weakref.WeakValueDictionary[str, _SharedClients]" = weakref.WeakValueDictionary()
+_shared_clients_lock = threading.Lock()
+
+def _credential_key(config: Dict[str, Any]) -> str:
+    """Digest of the credential settings, so secrets are never kept as lookup keys."""
+    material = json.dumps([config.get(k) for k in CREDENTIAL_KEYS])
+    return hashlib.sha256(material.encode()).hexdigest()
+
+class _CachingCredential:
+    """Wraps a TokenCredential and reuses its tokens per scope set until shortly before expiry."""
+    def __init__(self, inner: Any):
+        self._inner = inner
+        self._tokens: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def get_token(self, *scopes: str, **kwargs):
+        # Claims challenges and tenant overrides must always reach AAD
+        if kwargs.get("claims") or kwargs.get("tenant_id"):
+            return self._inner.get_token(*scopes, **kwargs)
+        key = tuple(sorted(scopes))
+        with self._lock:
+            token = self._tokens.get(key)
+            if token is None or time.time() >= token.expires_on - TOKEN_REFRESH_MARGIN:
+                token = self._inner.get_token(*scopes, **kwargs)
+                self._tokens[key] = token
+            return token
+
+    def close(self):
+        if hasattr(self._inner, "close"):
+            self._inner.close()
+
+class _BufferWriter:
+    """Seekable write-only stream over a preallocated buffer, so parallel downloads land in place."""
+    def __init__(self, buf: bytearray):
+        self._view = memoryview(buf)
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        base = (0, self._pos, len(self._view))[whence]
+        self._pos = base + offset
+        return self._pos
+
+    def write(self, data) -> int:
+        end = self._pos + len(data)
+        self._view[self._pos:end] = data
+        self._pos = end
+        return len(data)
+
 class AzureConnector(BaseConnector):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.container = config.get("container")
+        # Prefix stripped from paths passed to read_file/get_metadata
+        self._path_prefix = f"azure://{self.container}/"
         
-        # Initialize Data Plane Clients (Blob + DataLake)
-        if config.get("connection_string"):
-            self.client = BlobServiceClient.from_connection_string(config["connection_string"])
-            self.datalake_client = DataLakeServiceClient.from_connection_string(config["connection_string"])
-        elif config.get("azure_account_name"):
-            # Use Token Auth (SP credentials)
-            account_url = f"https://{config['azure_account_name']}.blob.core.windows.net"
-            dfs_url = f"https://{config['azure_account_name']}.dfs.core.windows.net"
-            
-            self._init_credential(config)
-            
-            self.client = BlobServiceClient(account_url, credential=self.credential)
-            self.datalake_client = DataLakeServiceClient(dfs_url, credential=self.credential)
-        elif config.get("azure_subscription_id"):
-            # Discovery-only mode
-            self._init_credential(config)
-            self.client = None
-            self.datalake_client = None
-        else:
-            raise ValueError("Either AZURE_CONNECTION_STRING, AZURE_ACCOUNT_NAME, or AZURE_SUBSCRIPTION_ID (for discovery) must be provided.")
-
-        if self.container:
-            self.file_system_client = self.datalake_client.get_file_system_client(self.container)
-        else:
-            self.file_system_client = None
-        
-        # Initialize Management Client if credentials are provided
-        self.mgmt_client = None
-        if config.get("azure_subscription_id") and self.credential:
-            self.mgmt_client = StorageManagementClient(self.credential, config["azure_subscription_id"])
-            
-        self._account_metadata_cache = None
+        # The blob client is built below by _init_data_clients; DataLake and management clients on first use
+        if not config.get("connection_string"):
+            if not (config.get("azure_account_name") or config.get("azure_subscription_id")):
+                raise ValueError("Either AZURE_CONNECTION_STRING, AZURE_ACCOUNT_NAME, or AZURE_SUBSCRIPTION_ID (for discovery) must be provided.")
+
+        # Connectors with the same credentials share one HTTP pool and token cache; everything else is per instance
+        key = _credential_key(config)
+        with _shared_clients_lock:
+            shared = _shared_clients.get(key)
+            if shared is None:
+                # Token Auth (SP credentials) for a single account or discovery-only mode
+                credential = None if config.get("connection_string") else self._build_credential(config)
+                shared = _shared_clients[key] = _SharedClients(self._build_transport(), credential)
+        # Held so the shared clients live as long as this connector
+        self._shared = shared
+        self.credential = shared.credential
+        self._transport = shared.transport
+
+        self._account_metadata_by_name: Dict[str, Dict[str, Any]] = {}
+        self._client_lock = threading.Lock()
+        self._account_meta_lock = threading.Lock()
+        # In-flight account metadata fetches, so concurrent callers share one request
+        self._account_meta_futures: Dict[str, Future] = {}
+        self._read_concurrency = int(config.get("azure_max_concurrency") or READ_CONCURRENCY)
+        # BlobServiceClient / DataLakeServiceClient per account, each built on first use
+        self._blob_services: Dict[str, Any] = {}
+        self._datalake_services: Dict[str, Any] = {}
+        # Account keys fetched after an RBAC denial; those accounts use key auth from then on
+        self._account_keys: Dict[str, str] = {}
+        # Blob listing include options accepted per (account, container), recorded after a denial
+        self._include_caps: Dict[Tuple[str, str], List[str]] = {}
+        # Container metadata owner per container (None when missing or not readable)
+        self._container_owners: Dict[str, str] = {}
+        # Per-instance memoized sub-clients; cleared whenever the service clients change
+        self._container_client = functools.lru_cache(maxsize=CLIENT_CACHE_SIZE)(self._build_container_client)
+        self._blob_client = functools.lru_cache(maxsize=CLIENT_CACHE_SIZE)(self._build_blob_client)
         
         # Initial clients
         self._init_data_clients(config.get("azure_account_name"))
 
     def _init_data_clients(self, account_name: str = None, account_key: str = None):
-        """Initializes or re-initializes blob and datalake clients for a specific account."""
+        """Initializes or re-initializes the blob client for a specific account."""
         if self.config.get("connection_string"):
-            self.client = BlobServiceClient.from_connection_string(self.config["connection_string"])
-            self.datalake_client = DataLakeServiceClient.from_connection_string(self.config["connection_string"])
+            from azure.storage.blob import BlobServiceClient
+            self.client = BlobServiceClient.from_connection_string(
+                self.config["connection_string"], transport=self._transport, max_chunk_get_size=MAX_CHUNK_GET_SIZE
+            )
         elif account_name:
-            account_url = f"https://{account_name}.blob.core.windows.net"
-            dfs_url = f"https://{account_name}.dfs.core.windows.net"
-            
-            # Use account key if provided, otherwise fallback to identity-based credential
-            cred = account_key if account_key else self.credential
-            
-            self.client = BlobServiceClient(account_url, credential=cred)
-            self.datalake_client = DataLakeServiceClient(dfs_url, credential=cred)
+            self.client = self._get_blob_service(account_name, account_key)
         else:
             self.client = None
-            self.datalake_client = None
+
+        # Rebuilt lazily against the current credentials
+        self.__dict__.pop("datalake_client", None)
+        self.__dict__.pop("file_system_client", None)
+        self._container_client.cache_clear()
+        self._blob_client.cache_clear()
+
+    @functools.cached_property
+    def datalake_client(self) -> Any:
+        """DataLake client for the configured account, built on first use (directory listing, POSIX owners)."""
+        if self.config.get("connection_string"):
+            from azure.storage.filedatalake import DataLakeServiceClient
+            return DataLakeServiceClient.from_connection_string(self.config["connection_string"], transport=self._transport)
+        account_name = self.config.get("azure_account_name")
+        return self._get_datalake_service(account_name) if account_name else None
+
+    @functools.cached_property
+    def file_system_client(self) -> Any:
+        """File system client for the configured container, built on first use."""
+        if self.container and self.datalake_client:
+            return self.datalake_client.get_file_system_client(self.container)
+        return None
+
+    @functools.cached_property
+    def mgmt_client(self) -> Any:
+        """Management plane client, built on first use when a subscription and credentials are configured."""
+        if self.config.get("azure_subscription_id") and self.credential:
+            from azure.mgmt.storage import StorageManagementClient
+            return StorageManagementClient(self.credential, self.config["azure_subscription_id"])
+        return None
+
+    def _build_transport(self) -> Any:
+        """One pooled requests transport for all data plane clients, so connections stay warm across accounts."""
+        import requests
+        from requests.adapters import HTTPAdapter
+        from azure.core.pipeline.transport import RequestsTransport
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        # The connector owns the session; closing an individual client must not close it
+        return RequestsTransport(session=session, session_owner=False)
+
+    def _build_container_client(self, container: str) -> Any:
+        return self.client.get_container_client(container)
+
+    def _build_blob_client(self, container: str, blob: str) -> Any:
+        return self.client.get_blob_client(container=container, blob=blob)
+
+    def _get_blob_service(self, account_name: str, account_key: str = None) -> Any:
+        """Returns the cached blob service client for an account, building it on first use.
+
+        Passing account_key switches the account to key auth; its DataLake client is rebuilt on next use.
+        """
+        client = self._blob_services.get(account_name)
+        if client is None or account_key:
+            from azure.storage.blob import BlobServiceClient
+            if account_key:
+                self._account_keys[account_name] = account_key
+                self._datalake_services.pop(account_name, None)
+            # Use account key if one was fetched, otherwise fallback to identity-based credential.
+            cred = self._account_keys.get(account_name) or self.credential
+            client = BlobServiceClient(
+                f"https://{account_name}.blob.core.windows.net",
+                credential=cred, transport=self._transport, max_chunk_get_size=MAX_CHUNK_GET_SIZE
+            )
+            if account_key:
+                self._blob_services[account_name] = client
+            else:
+                # Concurrent first use may race; keep whichever client landed first
+                client = self._blob_services.setdefault(account_name, client)
+        return client
+
+    def _get_datalake_service(self, account_name: str) -> Any:
+        """Returns the cached DataLake service client for an account, building it on first use."""
+        client = self._datalake_services.get(account_name)
+        if client is None:
+            from azure.storage.filedatalake import DataLakeServiceClient
+            cred = self._account_keys.get(account_name) or self.credential
+            client = DataLakeServiceClient(f"https://{account_name}.dfs.core.windows.net", credential=cred, transport=self._transport)
+            client = self._datalake_services.setdefault(account_name, client)
+        return client
+
+    def _clients_for(self, account_name: str) -> Tuple[Any, Any]:
+        """Returns the blob and datalake clients to use for an account."""
+        if self.config.get("connection_string") or not account_name or account_name == self.config.get("azure_account_name"):
+            return self.client, self.datalake_client
+        return self._get_blob_service(account_name), self._get_datalake_service(account_name)
 
     def _get_account_key(self, account_name: str, resource_group: str) -> str:
         """Fetches the storage account key using the Management API."""
@@ -75,74 +329,75 @@ class AzureConnector(BaseConnector):
             keys = self.mgmt_client.storage_accounts.list_keys(resource_group, account_name)
             return keys.keys[0].value
         except Exception as e:
-            import os
-            print(f"    ⚠️ Failed to fetch access key for {account_name}: {e}", file=os.sys.stderr)
+            logger.warning("    ⚠️ Failed to fetch access key for %s: %s", account_name, e)
             return None
 
-    def _init_credential(self, config: Dict[str, Any]):
+    def _build_credential(self, config: Dict[str, Any]) -> Any:
         """Helper to initialize the best available credential"""
+        from azure.identity import DefaultAzureCredential, ClientSecretCredential
         if (config.get("azure_client_id") and 
             config.get("azure_client_secret") and 
             config.get("azure_tenant_id")):
             # PREFER explicit config values if present
-            self.credential = ClientSecretCredential(
+            inner = ClientSecretCredential(
                 tenant_id=config["azure_tenant_id"],
                 client_id=config["azure_client_id"],
                 client_secret=config["azure_client_secret"]
             )
         else:
             # Fallback to Environment Variables / Managed Identity
-            self.credential = DefaultAzureCredential()
-
-    def list_objects(self, prefix: str = "", container: str = None, recursive: bool = True) -> List[FileMetadata]:
+            inner = DefaultAzureCredential()
+        # Every account client built during discovery shares one token per scope
+        return _CachingCredential(inner)
+
+    def list_objects(self, prefix: str = "", container: str = None, recursive: bool = True, include_acl: bool = False, include_tags: bool = False, pattern: str = None) -> List[FileMetadata]:
+        return list(self.iter_objects(prefix=prefix, container=container, recursive=recursive, include_acl=include_acl, include_tags=include_tags, pattern=pattern))
+
+    def list_objects_with_owner(self, prefix: str = "", container: str = None, recursive: bool = True) -> List[FileMetadata]:
+        """Lists objects with POSIX owners taken from one paged get_paths listing (HNS accounts) instead of per-path ACL calls."""
+        return self.list_objects(prefix=prefix, container=container, recursive=recursive, include_acl=True)
+
+    def iter_objects(self, prefix: str = "", container: str = None, recursive: bool = True, include_acl: bool = False, include_tags: bool = False, pattern: str = None) -> Iterator[FileMetadata]:
+        """
+        Yields entries as they are listed; discovery buffers per account so each account entry carries its summed size.
+        pattern is a path glob over blob names (e.g. 'logs/*/app.log', 'logs/**/*.json'); '*' does not cross '/', '**' does.
+        Its literal lead is used as the listing prefix.
+        """
         target_container = container or self.container
+        if pattern and not prefix:
+            prefix = _extract_literal_prefix(pattern)
         
         # Discovery Mode: If no container is specified, scan all accessible storage accounts and containers
         if not target_container:
-            import os
-            print("🔍 Discovering accessible Azure Storage Accounts...", file=os.sys.stderr)
+            logger.info("🔍 Discovering accessible Azure Storage Accounts...")
             accounts = self.list_storage_accounts()
-            print(f"Found {len(accounts)} accounts: {', '.join([a['name'] for a in accounts])}", file=os.sys.stderr)
-            
-            all_files = []
-            for acct in accounts:
-                try:
-                    # Switch account context
-                    print(f"  📂 Switching to account: {acct['name']}", file=os.sys.stderr)
-                    original_acct = self.config.get("azure_account_name")
-                    self.config["azure_account_name"] = acct["name"]
-                    self._init_data_clients(acct["name"]) # IMPORTANT: Re-init data plane clients
-                    
-                    containers = self.list_containers(acct["name"])
-                    print(f"  📦 Account {acct['name']}: Found {len(containers)} containers: {', '.join(containers)}", file=os.sys.stderr)
-                    
+            logger.info("Found %d accounts: %s", len(accounts), ', '.join([a['name'] for a in accounts]))
+
+            # Account metadata and container lists are independent per account, so fetch them all up front
+            container_lists = []
+            if accounts:
+                workers = max(1, min(MAX_ACCOUNT_WORKERS, len(accounts)))
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    metas = pool.map(lambda a: self._fetch_account_meta(a["name"], a["resource_group"], a["tags"]), accounts)
+                    container_lists = list(pool.map(lambda a: self.list_containers(a["name"]), accounts))
+                    list(metas)
+
+            # Fan out every (account, container) listing over one bounded pool; accounts are
+            # still emitted in order, each with its summed size ahead of its contents
+            pairs = [(acct, cont) for acct, containers in zip(accounts, container_lists) for cont in containers]
+            pool = ThreadPoolExecutor(max_workers=max(1, min(MAX_CONTAINER_WORKERS, len(pairs))))
+            scans = [pool.submit(self._scan_discovered_container, acct, cont, prefix, recursive, include_acl, include_tags, pattern) for acct, cont in pairs]
+            try:
+                pending = iter(scans)
+                for acct, containers in zip(accounts, container_lists):
+                    logger.info("  📦 Account %s: Found %d containers: %s", acct['name'], len(containers), ', '.join(containers))
+
                     account_resources = []
                     total_acct_size = 0
-                    
                     for cont in containers:
-                        container_size = 0
-                        container_items = []
-                        try:
-                            container_items = self.list_objects(prefix=prefix, container=cont, recursive=recursive)
-                            container_size = sum(item.size_bytes for item in container_items)
-                        except Exception as e:
-                            # If RBAC listing fails, try fetching account key and re-scanning
-                            if "AuthorizationPermissionMismatch" in str(e) or "not authorized" in str(e):
-                                print(f"    🔑 RBAC restricted for {acct['name']}. Fetching Access Key...", file=os.sys.stderr)
-                                key = self._get_account_key(acct["name"], acct["resource_group"])
-                                if key:
-                                    self._init_data_clients(acct["name"], account_key=key)
-                                    try:
-                                        container_items = self.list_objects(prefix=prefix, container=cont, recursive=recursive)
-                                        container_size = sum(item.size_bytes for item in container_items)
-                                        print(f"    ✅ Successfully scanned {cont} using Access Key.", file=os.sys.stderr)
-                                    except Exception as e2:
-                                        print(f"    ❌ Even with key, failed to list {cont}: {e2}", file=os.sys.stderr)
-                            else:
-                                print(f"    ❌ Warning: Could not list blobs in container {cont} (Account {acct['name']}): {e}", file=os.sys.stderr)
-                        
+                        container_size, container_items = next(pending).result()
                         # Add container entry itself
-                        print(f"    📏 Container {cont} aggregate size: {container_size} bytes", file=os.sys.stderr)
+                        logger.info("    📏 Container %s aggregate size: %s bytes", cont, container_size)
                         account_resources.append(FileMetadata(
                             path=f"azure://{acct['name']}/{cont}",
                             type="container",
@@ -154,9 +409,9 @@ class AzureConnector(BaseConnector):
                         ))
                         account_resources.extend(container_items)
                         total_acct_size += int(container_size)
-                    
+
                     # Ensure storage account entry has the summed size
-                    all_files.append(FileMetadata(
+                    yield FileMetadata(
                         path=f"azure://{acct['name']}",
                         type="storage_account",
                         size_bytes=total_acct_size,
@@ -169,97 +424,126 @@ class AzureConnector(BaseConnector):
                             "resource_group": acct["resource_group"],
                             "container_count": len(containers)
                         }
-                    ))
-                    all_files.extend(account_resources)
-                    
-                    # Restore original account context
-                    self.config["azure_account_name"] = original_acct
-                    self._init_data_clients(original_acct)
-                    self._account_metadata_cache = None # Clear cache for next account
-                except Exception as e:
-                    print(f"  ❌ Error scanning account {acct['name']}: {e}", file=os.sys.stderr)
-            return all_files
-            
-        container_client = self.client.get_container_client(target_container)
-        results = []
-
-        # Try to fetch account tags/props once to apply to all files
+                    )
+                    yield from account_resources
+            finally:
+                # A consumer that stops early should not wait for the remaining listings
+                for future in scans:
+                    future.cancel()
+                pool.shutdown(wait=False)
+            return
+
+        yield from self._iter_container(self.config.get("azure_account_name"), target_container, prefix, recursive, include_acl, include_tags, pattern)
+
+    def _iter_container(self, account_name: str, target_container: str, prefix: str, recursive: bool, include_acl: bool = False, include_tags: bool = False, pattern: str = None) -> Iterator[FileMetadata]:
+        """Resolves the given account's clients and context, then yields the entries of one container."""
+        blob_client, datalake_client = self._clients_for(account_name)
+        container_client = blob_client.get_container_client(target_container)
+
+        # Try to fetch account tags once to apply to all files
         account_tags = {}
-        account_props = {}
+        is_hns_enabled = None
         try:
             # We use get_account_metadata which now safely handles missing permissions
-            acct_meta = self.get_account_metadata()
+            acct_meta = self._get_account_meta(account_name)
             account_tags = acct_meta.get("tags") or {}
-            account_props = acct_meta.get("management_properties") or {}
+            is_hns_enabled = acct_meta.get("is_hns_enabled")
         except Exception:
             pass
 
-        # Use walk_blobs to get files and prefixes
-        # Optimization: Include metadata in the initial listing
-        # Avoid including 'tags' as it requires higher permissions (Data Owner) that may be missing
-        walk_args = {
-            "name_starts_with": prefix,
-            "include": ['metadata', 'tags']
-        }
-        if not recursive:
-            walk_args["delimiter"] = '/'
+        # One file system client for the whole listing (reuse the one built in __init__ when possible)
+        configured = account_name == self.config.get("azure_account_name")
+        if configured and target_container == self.container and self.file_system_client is not None:
+            fs_client = self.file_system_client
+        else:
+            fs_client = datalake_client.get_file_system_client(target_container) if datalake_client else None
 
-        try:
-            # Convert to list to get count and ensure we can iterate safely
-            blobs_list = list(container_client.walk_blobs(**walk_args))
-            import os
-            if target_container:
-                print(f"    📊 Container {target_container}: Discovered {len(blobs_list)} items.", file=os.sys.stderr)
-            blobs = blobs_list
-        except Exception:
-            # Fallback to no-include if metadata access is restricted
-            if "include" in walk_args:
-                del walk_args["include"]
-            blobs = list(container_client.walk_blobs(**walk_args))
-            import os
-            if target_container:
-                print(f"    📊 Container {target_container} (Fallback): Discovered {len(blobs)} items.", file=os.sys.stderr)
+        # POSIX owners are opt-in; fetch them in bulk rather than one ACL request per path
+        owner_map = {}
+        if include_acl and fs_client is not None and is_hns_enabled is not False:
+            owner_map = self._get_owner_map(fs_client, prefix, recursive)
 
+        yield from self._scan_container(container_client, fs_client, account_name, target_container, prefix, recursive, account_tags, owner_map, include_tags, pattern)
+
+    def _scan_container(self, container_client: Any, fs_client: Any, account_name: str, target_container: str, prefix: str, recursive: bool, account_tags: Dict[str, str], owner_map: Dict[str, str], include_tags: bool = False, pattern: str = None) -> Iterator[FileMetadata]:
+        """Yields one container's entries using only the clients and account context passed in."""
+        # Flat list_blobs for recursive listings; walk_blobs only when a '/' hierarchy is needed.
+        # Blob index tags need Data Owner and extra per-blob work, so they are opt-in.
+        list_args = {
+            "name_starts_with": prefix,
+            "results_per_page": LIST_PAGE_SIZE
+        }
+        include = ['metadata', 'tags'] if include_tags else ['metadata']
+        # Skip include options this container already rejected
+        caps_key = (account_name, target_container)
+        if caps_key in self._include_caps:
+            include = [i for i in include if i in self._include_caps[caps_key]]
+
+        def list_blobs(args: Dict[str, Any]):
+            if recursive:
+                return container_client.list_blobs(**args)
+            return container_client.walk_blobs(delimiter='/', **args)
+
+        # Pages are fetched lazily; pulling the first item surfaces permission errors before anything is yielded
+        # Fall back to fewer include options if access is denied, remembering what worked.
+        # Any other error (throttling, timeouts, a missing container) is raised as is and leaves the options alone.
+        label = target_container
+        attempts = [include[:n] for n in range(len(include), -1, -1)]
+        for i, attempt in enumerate(attempts):
+            args = dict(list_args, include=attempt) if attempt else list_args
+            try:
+                # The next page downloads while the current one is turned into entries
+                blobs = _prefetch_pages(list_blobs(args))
+                first = next(blobs, None)
+            except Exception as e:
+                if i == len(attempts) - 1 or not _is_authorization_denial(e):
+                    raise
+                continue
+            if i:
+                self._include_caps[caps_key] = attempt
+                label = f"{target_container} (Fallback)"
+            break
+        if first is not None:
+            blobs = itertools.chain((first,), blobs)
+
+        # Entries without tags of their own share one copy of the account tags (copy-on-write when merging)
+        shared_tags = dict(account_tags)
+        account_owner = self._get_owner_from_tags(account_tags)
+        # Connection-string connectors may not know their account name; their paths are container-relative
+        path_prefix = f"azure://{account_name}/{target_container}/" if account_name else f"azure://{target_container}/"
+
+        count = 0
+        folder_sizes = None
+        dir_paths: Dict[str, Any] = {}
+        # The service only narrows by prefix; the rest of a glob is matched here
+        glob_match = _compile_glob(pattern).fullmatch if pattern else None
         for blob in blobs:
+            if glob_match is not None and glob_match(blob.name) is None:
+                continue
+            count += 1
             if hasattr(blob, 'size'):
                 # Regular Blob
                 blob_metadata = getattr(blob, 'metadata', {}) or {}
                 
-                # Safe tag handling
-                blob_tags = {}
-                try:
-                    # Some SDK versions might return None or missing for tag_count
-                    t_count = getattr(blob, 'tag_count', 0)
-                    if t_count is not None and int(t_count) > 0:
-                        blob_tags = getattr(blob, 'tags', {}) or {}
-                except (Exception, TypeError, ValueError):
-                    pass
+                # Index tags arrive inline when listed with include=['tags'] (None otherwise)
+                blob_tags = getattr(blob, 'tags', None) or {}
                 
                 # Merge tags: blob tags take precedence over account tags
-                final_tags = account_tags.copy()
-                if blob_tags:
-                    final_tags.update(blob_tags)
+                final_tags = {**account_tags, **blob_tags} if blob_tags else shared_tags
 
                 owner = self._get_owner_from_tags(blob_tags) or \
                         self._get_owner_from_tags(blob_metadata) or \
-                        self._get_owner_from_tags(account_tags)
+                        account_owner
                 
-                # Fetch POSIX owner if HNS is enabled
-                if self.datalake_client:
-                    try:
-                        fs_client = self.datalake_client.get_file_system_client(target_container)
-                        f_client = fs_client.get_file_client(blob.name)
-                        acl = f_client.get_access_control()
-                        owner = acl.get('owner') or owner
-                    except Exception:
-                        pass
+                # POSIX owner from the bulk listing (HNS only)
+                owner = owner_map.get(blob.name) or owner
 
                 last_accessed = None
                 if hasattr(blob, 'last_accessed_on'):
                     last_accessed = blob.last_accessed_on
 
-                results.append(FileMetadata(
-                    path=f"azure://{self.config['azure_account_name']}/{target_container}/{blob.name}",
+                yield FileMetadata(
+                    path=path_prefix + blob.name,
                     type="file",
                     size_bytes=blob.size,
                     owner=owner,
@@ -268,52 +552,52 @@ class AzureConnector(BaseConnector):
                     source="azure",
                     content_type=blob.content_settings.content_type if hasattr(blob, 'content_settings') else None,
                     etag=getattr(blob, 'etag', None),
-                    tags=final_tags
-                ))
+                    tags=final_tags,
+                    # User metadata came back with the listing page; no get_blob_properties needed
+                    extra_metadata=blob_metadata
+                )
             else:
-                # BlobPrefix (Directory)
-                folder_size = 0
-                try:
-                    folder_size = self._calculate_folder_size(blob.name, target_container)
-                except Exception as e:
-                    print(f"    ❌ Warning: Could not calculate size for folder {blob.name} in container {target_container}: {e}", file=os.sys.stderr)
-
-                # Fetch directory properties if datalake client is available
+                # BlobPrefix (Directory): sizes for every directory come from one flat listing
+                if folder_sizes is None:
+                    folder_sizes = self._aggregate_sizes_by_prefix(container_client, prefix)
+                    # Properties for every directory at this level come from one get_paths listing
+                    if fs_client is not None:
+                        dir_paths = self._get_directory_map(fs_client, prefix)
+                folder_size = folder_sizes.get(blob.name, 0)
+
+                dir_name = blob.name.rstrip('/')
                 folder_modified = None
                 folder_metadata = {}
-                folder_tags = account_tags.copy()
-                folder_owner = None
-                
-                if self.datalake_client:
+                folder_tags = shared_tags
+                # POSIX owner from the bulk listing
+                folder_owner = owner_map.get(dir_name)
+
+                dir_path = dir_paths.get(dir_name)
+                if dir_path is not None:
+                    folder_modified = dir_path.last_modified
+                    if not folder_owner and dir_path.owner != '$superuser':
+                        folder_owner = dir_path.owner
+                elif fs_client is not None:
+                    # Missing from the batched listing: fall back to a per-directory lookup
                     try:
-                        # Ensure we have a file system client for this container
-                        fs_client = self.datalake_client.get_file_system_client(target_container)
-                        dir_client = fs_client.get_directory_client(blob.name.rstrip('/'))
-                        dir_props = dir_client.get_directory_properties()
+                        dir_props = fs_client.get_directory_client(dir_name).get_directory_properties()
                         folder_modified = dir_props.last_modified
                         folder_metadata = dir_props.metadata or {}
-                        
-                        # Fetch POSIX owner
-                        try:
-                            acl = dir_client.get_access_control()
-                            folder_owner = acl.get('owner')
-                        except Exception:
-                            pass
-
-                        # Try to fetch tags via Blob API for the directory path
-                        try:
-                            temp_blob_client = container_client.get_blob_client(blob.name.rstrip('/'))
-                            tags = temp_blob_client.get_blob_tags()
-                            if tags:
-                                folder_tags.update(tags)
-                        except Exception:
-                            pass
                     except Exception:
                         # Directory might not be a real object (non-HNS)
                         pass
 
-                results.append(FileMetadata(
-                    path=f"azure://{self.config['azure_account_name']}/{target_container}/{blob.name}",
+                # Directory index tags cost one request each, so they follow the include_tags opt-in
+                if include_tags and fs_client is not None:
+                    try:
+                        tags = container_client.get_blob_client(dir_name).get_blob_tags()
+                        if tags:
+                            folder_tags = {**account_tags, **tags}
+                    except Exception:
+                        pass
+
+                yield FileMetadata(
+                    path=path_prefix + blob.name,
                     type="directory",
                     size_bytes=folder_size,
                     owner=folder_owner or self._get_owner_from_tags(folder_metadata),
@@ -321,83 +605,167 @@ class AzureConnector(BaseConnector):
                     last_accessed=None,
                     source="azure",
                     tags=folder_tags
-                ))
+                )
 
-        return results
+        logger.info("    📊 Container %s: Discovered %d items.", label, count)
 
-    def read_file(self, path: str, container: str = None) -> bytes:
+    def _get_directory_map(self, fs_client: Any, prefix: str) -> Dict[str, Any]:
+        """Fetches path properties (last_modified, owner) for one directory level with a single paged get_paths listing."""
+        paths = {}
+        # get_paths needs a directory; a partial name prefix narrows to its parent directory
+        directory = prefix.rsplit('/', 1)[0] if '/' in prefix else None
+        try:
+            for path in fs_client.get_paths(path=directory, recursive=False):
+                if path.is_directory:
+                    paths[path.name] = path
+        except Exception:
+            pass
+        return paths
+
+    def _get_owner_map(self, fs_client: Any, prefix: str, recursive: bool) -> Dict[str, str]:
+        """Fetches POSIX owners for all paths under prefix with a single paged get_paths listing."""
+        owners = {}
+        # get_paths needs a directory; a partial name prefix narrows to its parent directory
+        directory = prefix.rsplit('/', 1)[0] if '/' in prefix else None
+        try:
+            for path in fs_client.get_paths(path=directory, recursive=recursive):
+                if path.owner:
+                    owners[path.name] = path.owner
+        except Exception:
+            pass
+        return owners
+
+    def _scan_discovered_container(self, acct: Dict[str, Any], cont: str, prefix: str, recursive: bool, include_acl: bool = False, include_tags: bool = False, pattern: str = None) -> Tuple[int, List[FileMetadata]]:
+        """Lists one container during discovery, retrying with the account key if RBAC denies access."""
+        container_size = 0
+        container_items = []
+        try:
+            container_items = list(self._iter_container(acct["name"], cont, prefix, recursive, include_acl, include_tags, pattern))
+            container_size = sum(item.size_bytes for item in container_items)
+        except Exception as e:
+            # If RBAC listing fails, try fetching account key and re-scanning
+            if "AuthorizationPermissionMismatch" in str(e) or "not authorized" in str(e):
+                logger.warning("    🔑 RBAC restricted for %s. Fetching Access Key...", acct['name'])
+                with self._client_lock:
+                    key = self._get_account_key(acct["name"], acct["resource_group"])
+                    if key:
+                        self._get_blob_service(acct["name"], account_key=key)
+                if key:
+                    try:
+                        container_items = list(self._iter_container(acct["name"], cont, prefix, recursive, include_acl, include_tags, pattern))
+                        container_size = sum(item.size_bytes for item in container_items)
+                        logger.info("    ✅ Successfully scanned %s using Access Key.", cont)
+                    except Exception as e2:
+                        logger.error("    ❌ Even with key, failed to list %s: %s", cont, e2)
+            else:
+                logger.warning("    ❌ Warning: Could not list blobs in container %s (Account %s): %s", cont, acct['name'], e)
+        return container_size, container_items
+
+    def _resolve_blob_client(self, path: str, container: str = None) -> Any:
         # Expect path to be like azure://container/blob_name or just blob_name
         # If it's the full path we construct, it's "azure://{container}/{blob.name}"
-        
         target_container = container or self.container
         # Simple parsing logic
-        prefix = f"azure://{target_container}/"
+        prefix = self._path_prefix if target_container == self.container else f"azure://{target_container}/"
         if path.startswith(prefix):
             blob_name = path[len(prefix):]
         else:
             blob_name = path
-            
-        blob_client = self.client.get_blob_client(container=target_container, blob=blob_name)
-        return blob_client.download_blob().readall()
-
-    def get_metadata(self, path: str) -> FileMetadata:
-        # Simple parsing logic
-        prefix = f"azure://{self.container}/"
-        if path.startswith(prefix):
-            blob_name = path[len(prefix):]
-        else:
-            blob_name = path
-            
-        blob_client = self.client.get_blob_client(container=self.container, blob=blob_name)
-        props = blob_client.get_blob_properties()
-        
-        # Try to fetch owner using DataLake client if possible (HNS), but avoid fetching full ACL
-        owner = None
-        try:
-             # We skip get_access_control() as per request to not fetch access control
-             pass
-        except Exception:
-             pass
-        
-        # Priority 2: Check Blob Tags (Index Tags)
-        if not owner or owner == '$superuser':
-            try:
-                tags = blob_client.get_blob_tags()
-                owner = self._get_owner_from_tags(tags) or owner
-            except Exception:
-                pass
-        
-        # Priority 3: Check Container Metadata
-        if not owner or owner == '$superuser':
-            # Check container metadata (which can store 'tags' like owner)
-            try:
-                container_client = self.client.get_container_client(self.container)
-                container_props = container_client.get_container_properties()
-                # Check for 'owner' or 'Owner' in metadata
-                meta = container_props.metadata or {}
-                owner = self._get_owner_from_tags(meta) or owner
-            except Exception:
-                pass
+        return self._blob_client(target_container, blob_name)
 
-        # Priority 3: Fetch Blob Tags (Data Plane)
+    def read_file(self, path: str, container: str = None) -> bytes:
+        blob_client = self._resolve_blob_client(path, container)
+        # Fetch ranges concurrently straight into a buffer sized from the first response
+        download = blob_client.download_blob(max_concurrency=self._read_concurrency)
+        buf = bytearray(download.size)
+        download.readinto(_BufferWriter(buf))
+        return bytes(buf)
+
+    def iter_file(self, path: str, container: str = None) -> Iterator[bytes]:
+        """Yields a blob's content chunk by chunk (MAX_CHUNK_GET_SIZE each), so only the chunk in hand is held in memory."""
+        blob_client = self._resolve_blob_client(path, container)
+        yield from blob_client.download_blob().chunks()
+
+    def read_file_to_path(self, path: str, dest: str, container: str = None) -> int:
+        """Downloads a blob straight to a local file and returns the number of bytes written.
+
+        Ranges are written at their offsets as they arrive, so the blob is never held in memory.
+        """
+        blob_client = self._resolve_blob_client(path, container)
+        download = blob_client.download_blob(max_concurrency=self._read_concurrency)
+        with open(dest, "wb") as f:
+            return download.readinto(f)
+
+    def get_metadata(self, path: str, account_meta: Dict[str, Any] = None) -> FileMetadata:
+        """account_meta lets batch callers pass in the result of get_account_metadata() once."""
+        blob_client = self._resolve_blob_client(path)
+
+        # The probes are independent requests: issue them together, then apply the owner priority.
+        # Container owner and account metadata are cached after the first call and then read directly.
+        props_future = self._probe(blob_client.get_blob_properties)
+        tags_future = self._probe(blob_client.get_blob_tags)
+        container_owner_future = None
+        if self.container not in self._container_owners:
+            container_owner_future = self._probe(self._get_container_owner, self.container)
+        if account_meta is None:
+            account_meta = self._account_metadata_by_name.get(self.config.get("azure_account_name"))
+        account_future = self._probe(self.get_account_metadata) if account_meta is None else None
+        props = props_future.result()
         blob_tags = {}
         try:
-            blob_tags = blob_client.get_blob_tags()
+            blob_tags = tags_future.result() or {}
         except Exception:
             pass
+        try:
+            if account_future is not None:
+                account_meta = account_future.result()
+        except Exception:
+            account_meta = {}
+        container_owner = container_owner_future.result() if container_owner_future is not None else self._container_owners[self.container]
+        return self._build_file_metadata(path, props, blob_tags, container_owner, account_meta)
 
-        # Priority 4: Check Account Tags (Management Plane)
-        account_tags = {}
-        account_props = {}
+    def get_metadata_batch(self, paths: List[str]) -> List[FileMetadata]:
+        """Fetches metadata for many blobs of the configured container concurrently.
+
+        The container owner and account metadata are resolved once for the whole batch.
+        Paths whose properties cannot be read are logged and left out of the result.
+        """
         try:
             account_meta = self.get_account_metadata()
-            account_tags = account_meta.get('tags') or {}
-            account_props = account_meta.get('management_properties') or {}
-            
-            if not owner or owner == '$superuser':
-                owner = self._get_owner_from_tags(account_tags) or owner
         except Exception:
-            pass
+            account_meta = {}
+        container_owner = self._get_container_owner(self.container)
+
+        def fetch(path: str) -> FileMetadata:
+            blob_client = self._resolve_blob_client(path)
+            try:
+                props = blob_client.get_blob_properties()
+            except Exception as e:
+                logger.warning("Could not read properties of %s: %s", path, e)
+                return None
+            blob_tags = {}
+            try:
+                blob_tags = blob_client.get_blob_tags() or {}
+            except Exception:
+                pass
+            return self._build_file_metadata(path, props, blob_tags, container_owner, account_meta)
+
+        return self._map_batch(fetch, paths)
+
+    def _build_file_metadata(self, path: str, props: Any, blob_tags: Dict[str, str], container_owner: str, account_meta: Dict[str, Any]) -> FileMetadata:
+        # Priority 1: Blob Tags (Index Tags). Fetched once; they also feed the merged tags below.
+        # The ACL owner is deliberately not fetched (get_access_control is a request per blob).
+        owner = self._get_owner_from_tags(blob_tags)
+        
+        # Priority 2: Container Metadata, looked up once per container (failures included)
+        if not owner or owner == '$superuser':
+            owner = container_owner or owner
+
+        # Priority 3: Check Account Tags (Management Plane, cached)
+        account_tags = account_meta.get('tags') or {}
+        account_props = account_meta.get('management_properties') or {}
+        if not owner or owner == '$superuser':
+            owner = self._get_owner_from_tags(account_tags) or owner
             
         final_tags = account_tags.copy()
         if blob_tags:
@@ -422,13 +790,26 @@ class AzureConnector(BaseConnector):
             extra_metadata=final_extra_metadata
         )
 
+    def _get_container_owner(self, container: str) -> str:
+        """Returns the owner recorded in a container's metadata; results and failures are cached per container."""
+        if container in self._container_owners:
+            return self._container_owners[container]
+        owner = None
+        try:
+            container_props = self._container_client(container).get_container_properties()
+            # Check for 'owner' or 'Owner' in metadata (which can store 'tags' like owner)
+            owner = self._get_owner_from_tags(container_props.metadata or {})
+        except Exception:
+            pass
+        self._container_owners[container] = owner
+        return owner
+
     def get_container_metadata(self) -> Dict[str, Any]:
         if not self.container:
              raise ValueError("Container not configured. Cannot get container metadata.")
              
-        # Force a refresh of the container client each time to ensure it's using the key-based client if re-initialized.
-        # This line was already present, ensuring the client is fetched.
-        container_client = self.client.get_container_client(self.container)
+        # Memoized; _init_data_clients clears the cache so a re-initialized (e.g. key-based) client is picked up
+        container_client = self._container_client(self.container)
         props = container_client.get_container_properties()
         
         return {
@@ -442,21 +823,54 @@ class AzureConnector(BaseConnector):
         }
 
     def get_account_metadata(self) -> Dict[str, Any]:
-        if self._account_metadata_cache:
-            return self._account_metadata_cache
+        account_name = self.config.get("azure_account_name")
+        cached = self._account_metadata_by_name.get(account_name)
+        if cached is not None:
+            return cached
+
+        # Single flight: the first caller fetches, concurrent callers wait on the same future
+        with self._account_meta_lock:
+            cached = self._account_metadata_by_name.get(account_name)
+            if cached is not None:
+                return cached
+            future = self._account_meta_futures.get(account_name)
+            leader = future is None
+            if leader:
+                future = self._account_meta_futures[account_name] = Future()
+
+        if leader:
+            try:
+                future.set_result(self._fetch_account_meta(account_name, self.config.get("azure_resource_group"), self.config.get("azure_account_tags")))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._account_meta_lock:
+                    self._account_meta_futures.pop(account_name, None)
+        return future.result()
+
+    def _get_account_meta(self, account_name: str) -> Dict[str, Any]:
+        """Returns cached metadata for any account, fetching it on first use."""
+        if account_name == self.config.get("azure_account_name"):
+            return self.get_account_metadata()
+        cached = self._account_metadata_by_name.get(account_name)
+        if cached is not None:
+            return cached
+        return self._fetch_account_meta(account_name, None)
+
+    def _fetch_account_meta(self, account_name: str, rg: str, tags: Dict[str, str] = None) -> Dict[str, Any]:
+        """Fetches data and management plane metadata for one account and caches it by name."""
+        client = self.client
+        if account_name and not self.config.get("connection_string"):
+            client = self._get_blob_service(account_name)
 
         info = {}
         try:
-            info = self.client.get_account_information()
+            info = client.get_account_information()
         except Exception as e:
-            print(f"Warning: Data Plane access failed (check RBAC roles): {e}")
+            logger.warning("Warning: Data Plane access failed (check RBAC roles): %s", e)
         
-        tags = self.config.get("azure_account_tags") or {}
+        tags = tags or {}
         mgmt_props = {}
-        
-        # Determine resource group and account name
-        rg = self.config.get("azure_resource_group")
-        account_name = self.config.get("azure_account_name")
 
         if self.mgmt_client and rg and account_name:
             try:
@@ -476,9 +890,9 @@ class AzureConnector(BaseConnector):
                     "primary_endpoints": account.primary_endpoints.as_dict() if account.primary_endpoints else None
                 }
             except Exception as e:
-                print(f"Warning: Failed to fetch account tags/props for {account_name} in {rg}: {e}")
+                logger.warning("Warning: Failed to fetch account tags/props for %s in %s: %s", account_name, rg, e)
 
-        self._account_metadata_cache = {
+        meta = {
             "sku_name": info.get('sku_name'),
             "account_kind": info.get('account_kind'),
             "is_hns_enabled": info.get('is_hns_enabled'),
@@ -486,20 +900,25 @@ class AzureConnector(BaseConnector):
             "management_properties": mgmt_props,
             "source": "azure"
         }
-        return self._account_metadata_cache
-
-    def _calculate_folder_size(self, prefix: str, container: str = None) -> int:
-        """Calculates total size of a folder by traversing its contents."""
-        target_container = container or self.container
-        if not target_container: return 0
-        container_client = self.client.get_container_client(target_container)
-        total_size = 0
+        self._account_metadata_by_name[account_name] = meta
+        return meta
+
+    def _aggregate_sizes_by_prefix(self, container_client: Any, prefix: str) -> Dict[str, int]:
+        """
+        Lists every blob under prefix once and sums sizes per first-level directory.
+        Keys match the BlobPrefix names returned by a '/'-delimited walk (e.g. 'prefix/dir/').
+        """
+        sizes: Dict[str, int] = {}
+        start = len(prefix)
         try:
             for blob in container_client.list_blobs(name_starts_with=prefix):
-                 total_size += blob.size
-        except Exception:
-            pass
-        return total_size
+                rest = blob.name[start:]
+                if '/' in rest:
+                    key = prefix + rest.split('/', 1)[0] + '/'
+                    sizes[key] = sizes.get(key, 0) + blob.size
+        except Exception as e:
+            logger.warning("    ❌ Warning: Could not calculate folder sizes under '%s': %s", prefix, e)
+        return sizes
 
     def list_storage_accounts(self) -> List[Dict[str, Any]]:
         """Lists all storage accounts with their metadata."""
@@ -522,7 +941,7 @@ class AzureConnector(BaseConnector):
                     "location": account.location
                 })
         except Exception as e:
-            print(f"Error listing storage accounts: {e}")
+            logger.error("Error listing storage accounts: %s", e)
             
         return accounts
 
@@ -532,8 +951,7 @@ class AzureConnector(BaseConnector):
         # If account_name is provided, we might need a temporary client
         client = self.client
         if account_name and account_name != self.config.get("azure_account_name"):
-             account_url = f"https://{account_name}.blob.core.windows.net"
-             client = BlobServiceClient(account_url, credential=self.credential)
+             client = self._get_blob_service(account_name)
              
         if not client:
              return []
@@ -543,7 +961,7 @@ class AzureConnector(BaseConnector):
             for container in client.list_containers():
                 containers.append(container.name)
         except Exception as e:
-            print(f"Error listing containers: {e}")
+            logger.error("Error listing containers: %s", e)
             
         return containers
 
@@ -587,6 +1005,10 @@ class AzureConnectorBuilder:
         self._config["azure_account_tags"] = tags
         return self
 
+    def max_concurrency(self, max_concurrency: int):
+        self._config["azure_max_concurrency"] = max_concurrency
+        return self
+
     def build(self) -> AzureConnector:
         if not any([self._config.get("connection_string"), 
                    self._config.get("azure_account_name"),
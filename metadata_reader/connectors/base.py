@@ -1,10 +1,172 @@
+import queue
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Tuple
 from ..models.metadata import FileMetadata
 
+# Spellings of the owner tag key tried by exact lookup before the case-insensitive scan
+OWNER_TAG_KEYS = ("owner", "Owner", "OWNER")
+# Concurrent lookups (properties, tags, owner, ...) issued by a single get_metadata call
+METADATA_PROBE_WORKERS = 4
+# Objects whose metadata get_metadata_batch fetches at once
+METADATA_BATCH_WORKERS = 32
+
+def prefetch(values: Iterable[Any], depth: int) -> Iterator[Any]:
+    """
+    Yields the values of an iterable while a background thread produces the following ones (at most depth ahead).
+    Used to overlap listing page requests with the processing of the current page.
+    Once the consumer is closed the producer requests nothing further; depth <= 0 iterates values inline.
+    """
+    if depth <= 0:
+        yield from values
+        return
+
+    buffer: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(value: Any) -> bool:
+        # Give up once the consumer has gone away instead of blocking forever
+        while not stop.is_set():
+            try:
+                buffer.put(value, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        iterator = iter(values)
+        try:
+            # Checked before each value, so a closed consumer stops the requests and not just the hand-off
+            while not stop.is_set():
+                try:
+                    value = next(iterator)
+                except StopIteration:
+                    break
+                if not put(value):
+                    break
+        except BaseException as e:
+            put(e)
+        finally:
+            if hasattr(iterator, "close"):
+                iterator.close()
+            # Always wake the consumer, even when the producer died
+            put(done)
+
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            value = buffer.get()
+            if value is done:
+                return
+            if isinstance(value, BaseException):
+                raise value
+            yield value
+    finally:
+        stop.set()
+
+def _container_covers(cached: Any, container: Any) -> bool:
+    """
+    Whether a listing cached for one container can include entries of another (the first part of their cache keys).
+    None, whole or per component of a hierarchical (catalog, schema, volume) key, stands for any container.
+    """
+    if cached is None or container is None:
+        return True
+    if isinstance(cached, tuple) and isinstance(container, tuple):
+        return all(c is None or p is None or c == p for c, p in zip(cached, container))
+    return cached == container
+
 class BaseConnector(ABC):
     def __init__(self, config: Dict[str, Any]):
         self.config = config
+        # Seconds a list_objects result is reused for the same arguments; 0 (the default) disables the cache
+        self._list_cache_ttl = float(config.get("list_cache_ttl") or 0)
+        # (container, prefix, ...) -> (listed at, entries)
+        self._list_cache: Dict[Tuple, Tuple[float, List[FileMetadata]]] = {}
+        self._list_cache_lock = threading.Lock()
+        # Pool for get_metadata's independent lookups; started on first use and shut down by close()
+        self._probe_pool: ThreadPoolExecutor = None
+        self._probe_pool_lock = threading.Lock()
+
+    def _probe(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Starts one of get_metadata's independent lookups on the connector's probe pool."""
+        with self._probe_pool_lock:
+            if self._probe_pool is None:
+                self._probe_pool = ThreadPoolExecutor(max_workers=METADATA_PROBE_WORKERS)
+            pool = self._probe_pool
+        return pool.submit(fn, *args, **kwargs)
+
+    def _map_batch(self, fetch: Callable[[Any], Any], items: Iterable[Any]) -> List[Any]:
+        """
+        Runs fetch over items on up to METADATA_BATCH_WORKERS threads, for get_metadata_batch.
+        Results keep the input order and leave out items fetch returned None for; the pool lives only for the call.
+        """
+        with ThreadPoolExecutor(max_workers=METADATA_BATCH_WORKERS) as pool:
+            return [result for result in pool.map(fetch, items) if result is not None]
+
+    def close(self):
+        """
+        Stops the connector's worker threads. Connectors holding network clients release them as well.
+        The connector stays usable; a later get_metadata starts a new pool.
+        """
+        with self._probe_pool_lock:
+            pool, self._probe_pool = self._probe_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _cached_listing(self, key: Tuple, list_entries: Callable[[], List[FileMetadata]]) -> List[FileMetadata]:
+        """
+        Returns a copy of a listing made within the last list_cache_ttl seconds, or lists and caches it.
+        key starts with the container and the listing prefix; see invalidate().
+        """
+        if self._list_cache_ttl <= 0:
+            return list_entries()
+        with self._list_cache_lock:
+            cached = self._list_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < self._list_cache_ttl:
+            return list(cached[1])
+        entries = list_entries()
+        with self._list_cache_lock:
+            self._list_cache[key] = (time.monotonic(), entries)
+        return list(entries)
+
+    def invalidate(self, path: str = None):
+        """
+        Drops cached listings that could contain path, or entries below it: those of its container (or of every
+        container, for discovery listings) whose prefix the path starts with or lies under.
+        Without a path, the whole listing cache is cleared.
+        path may be a full URI or, for connectors with a configured container, a path within it.
+        """
+        with self._list_cache_lock:
+            if path is None:
+                self._list_cache.clear()
+                return
+            container, relative = self._split_path(path)
+            relative = relative.lstrip("/")
+            stale = []
+            for key in self._list_cache:
+                prefix = (key[1] or "").lstrip("/")
+                if _container_covers(key[0], container) and (relative.startswith(prefix) or prefix.startswith(relative)):
+                    stale.append(key)
+            for key in stale:
+                del self._list_cache[key]
+
+    def _split_path(self, path: str) -> Tuple[Any, str]:
+        """
+        Splits a path into the container part of a listing cache key and the path within that container, for invalidate().
+        The container is None when the path does not name one; connectors with containers override this.
+        """
+        return None, path
 
     def _get_owner_from_tags(self, tags: Dict[str, str]) -> str:
         """
@@ -13,16 +175,40 @@ class BaseConnector(ABC):
         """
         if not tags:
             return None
+
+        for key in OWNER_TAG_KEYS:
+            v = tags.get(key)
+            if v:
+                return v
         
         for k, v in tags.items():
             if k.strip().lower() == "owner":
                 return v
         return None
 
+    def _limit_entries(self, entries: Iterator[FileMetadata], path_filter: Callable[[str], bool] = None, max_results: int = None) -> Iterator[FileMetadata]:
+        """
+        Applies iter_objects' path_filter and max_results to a lazy stream of entries.
+        Stopping after max_results closes the stream, so no further pages are fetched.
+        """
+        if path_filter is not None:
+            entries = (entry for entry in entries if path_filter(entry.path))
+        if max_results is not None:
+            entries = islice(entries, max_results)
+        return entries
+
     @abstractmethod
     def list_objects(self, prefix: str = "", recursive: bool = True) -> List[FileMetadata]:
         pass
 
+    def iter_objects(self, *args, **kwargs) -> Iterator[FileMetadata]:
+        """
+        Yields metadata entries one at a time. Accepts the same arguments as list_objects.
+        
+        Connectors that can stream results override this; the default wraps list_objects.
+        """
+        return iter(self.list_objects(*args, **kwargs))
+
     @abstractmethod
     def read_file(self, path: str) -> bytes:
         """
@@ -1,89 +1,121 @@
 from databricks.sdk import WorkspaceClient
-from typing import List, Dict, Any
+from databricks.sdk.core import Config
+from typing import List, Dict, Any, Callable, Iterator, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from .base import BaseConnector
 from ..models.metadata import FileMetadata
 from datetime import datetime
 import os
+import posixpath
+
+# Directories listed concurrently by the Files API walk
+MAX_LIST_WORKERS = 16
+# Keep-alive connections kept by the SDK's HTTP session (its default is 20, and the pool blocks when exhausted)
+HTTP_POOL_SIZE = 64
+# A level with this many directories or fewer is listed inline; the pool only pays off on wide trees
+PARALLEL_LIST_THRESHOLD = 4
 
 class DatabricksConnector(BaseConnector):
+    # Name of the Files API entry attribute holding the modification time, resolved from the first entry seen
+    _mtime_attr: str = None
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
-        self.host = config["databricks_host"]
-        self.token = config["databricks_token"]
+        self.host = config.get("databricks_host")
+        self.token = config.get("databricks_token")
         self.catalog = config.get("databricks_catalog")
         self.schema = config.get("databricks_schema")
         self.volume = config.get("databricks_volume")
         self.owner = config.get("databricks_owner")
+        self.max_workers = int(config.get("databricks_max_workers") or MAX_LIST_WORKERS)
         
         if not self.host or not self.token:
              raise ValueError("Databricks Host and Token are required.")
              
-        self.client = WorkspaceClient(host=self.host, token=self.token)
+        # The SDK wires these two settings into the adapter the other way round, so keep them equal
+        pool_size = max(HTTP_POOL_SIZE, self.max_workers)
+        self.client = WorkspaceClient(config=Config(
+            host=self.host,
+            token=self.token,
+            max_connection_pools=pool_size,
+            max_connections_per_pool=pool_size
+        ))
 
-    def list_objects(self, prefix: str = "", catalog: str = None, schema: str = None, volume: str = None, recursive: bool = True) -> List[FileMetadata]:
+    def list_objects(self, prefix: str = "", catalog: str = None, schema: str = None, volume: str = None, recursive: bool = True,
+                     compute_sizes: bool = True) -> List[FileMetadata]:
         """
         Lists files from the configured Unity Catalog Volume or scans all accessible volumes.
+        With compute_sizes=False only the requested depth is walked and directory sizes are left as None.
+        """
+        # DBFS listings are keyed apart from volumes so invalidate() can tell them apart
+        volume_key = "dbfs" if prefix.startswith("dbfs:") else (catalog or self.catalog, schema or self.schema, volume or self.volume)
+        return self._cached_listing(
+            (volume_key, prefix, recursive, compute_sizes),
+            lambda: list(self.iter_objects(prefix, catalog, schema, volume, recursive, compute_sizes=compute_sizes))
+        )
+
+    def iter_objects(self, prefix: str = "", catalog: str = None, schema: str = None, volume: str = None, recursive: bool = True,
+                     path_filter: Callable[[str], bool] = None, max_results: int = None, compute_sizes: bool = True) -> Iterator[FileMetadata]:
+        """
+        Yields the entries list_objects returns, walking the volume lazily.
+        Only entries whose path passes path_filter are yielded; the walk stops once max_results have been yielded.
         """
+        return self._limit_entries(self._iter_entries(prefix, catalog, schema, volume, recursive, compute_sizes), path_filter, max_results)
+
+    def _iter_entries(self, prefix: str, catalog: str, schema: str, volume: str, recursive: bool, compute_sizes: bool = True) -> Iterator[FileMetadata]:
         target_catalog = catalog or self.catalog
         target_schema = schema or self.schema
         target_volume = volume or self.volume
 
         if not target_catalog or not target_schema or not target_volume:
             if prefix.startswith("dbfs:"):
-                return self._list_dbfs(prefix)
+                yield from self._list_dbfs(prefix)
+                return
             
             # Discovery Mode: Scan all accessible volumes
             print("🔍 Discovering accessible Databricks Volumes...", file=os.sys.stderr)
             volumes = self.list_volumes()
             print(f"Found {len(volumes)} resource entries (Catalogs/Schemas/Volumes).", file=os.sys.stderr)
             
-            all_entries = []
             for item in volumes:
                 try:
                     if item["type"] == "catalog":
-                        all_entries.append(FileMetadata(
+                        yield FileMetadata(
                             path=f"databricks://{item['catalog']}",
                             type="databricks_catalog",
                             size_bytes=0,
                             last_modified=None,
                             source="databricks",
                             owner=item.get("owner")
-                        ))
+                        )
                     elif item["type"] == "schema":
-                        all_entries.append(FileMetadata(
+                        yield FileMetadata(
                             path=f"databricks://{item['catalog']}/{item['schema']}",
                             type="databricks_schema",
                             size_bytes=0,
                             last_modified=None,
                             source="databricks",
                             owner=item.get("owner")
-                        ))
+                        )
                     elif item["type"] == "volume":
                         # Scan volume contents for sizing
-                        vol_items = self.list_objects(
-                            catalog=item["catalog"],
-                            schema=item["schema"],
-                            volume=item["name"],
-                            prefix=prefix,
-                            recursive=recursive
-                        )
+                        vol_items = list(self._iter_entries(prefix, item["catalog"], item["schema"], item["name"], recursive, compute_sizes))
                         vol_size = sum(f.size_bytes for f in vol_items if f.type == "file")
                         
                         # Add volume entry itself
-                        all_entries.append(FileMetadata(
+                        yield FileMetadata(
                             path=item["full_path"],
                             type="databricks_volume_resource",
                             size_bytes=vol_size,
                             last_modified=None,
                             source="databricks",
                             owner=item.get("owner")
-                        ))
+                        )
                         # Add volume contents
-                        all_entries.extend(vol_items)
+                        yield from vol_items
                 except Exception as e:
                     print(f"  ❌ Error processing {item.get('type')} {item.get('name')}: {e}", file=os.sys.stderr)
-            
-            return all_entries
+            return
 
         # Construct Volume Root Path
         volume_root = f"/Volumes/{target_catalog}/{target_schema}/{target_volume}"
@@ -99,85 +131,136 @@ class DatabricksConnector(BaseConnector):
         # If prefix provided, append it (handle leading slashes)
         search_path = volume_root
         if prefix:
-             search_path = os.path.join(volume_root, prefix.lstrip("/"))
+             search_path = posixpath.join(volume_root, prefix.lstrip("/"))
              
-        results = []
-        
+        total_size = 0 if compute_sizes else None
+        try:
+            # Files stream out as the walk reaches them; directories follow once their sizes are known
+            total_size = yield from self._iter_volume_files(search_path, recursive=recursive, compute_sizes=compute_sizes)
+        except Exception as e:
+             print(f"Error listing Databricks path {search_path}: {e}")
+
         # Add the search path itself as a directory entry if at volume root or specified
         if not prefix or prefix == "/":
-            try:
-                # Attempt to get volume properties for accurate size
-                vol_size = self._calculate_folder_size(search_path)
-                results.append(FileMetadata(
-                    path=search_path,
-                    type="directory",
-                    size_bytes=vol_size,
-                    source="databricks_volume",
-                    owner=self.owner,
-                    last_modified=None
-                ))
-            except Exception:
-                pass
+            yield FileMetadata(
+                path=search_path,
+                type="directory",
+                size_bytes=total_size,
+                source="databricks_volume",
+                owner=self.owner,
+                last_modified=None
+            )
 
+    def _list_directory(self, path: str) -> List[Any]:
         try:
-            # Listing helper for children
-            self._fetch_volume_files(search_path, results, recursive=recursive)
+            return list(self.client.files.list_directory_contents(path))
         except Exception as e:
-             print(f"Error listing Databricks path {search_path}: {e}")
-             
-        return results
+             print(f"Error scanning directory {path}: {e}")
+             return []
 
-    def _fetch_volume_files(self, path: str, results: List[FileMetadata], recursive: bool = True):
-        # Databricks SDK for Files API (Unity Catalog Volumes)
-        # client.files.list_directory_contents(path)
+    def _walk_directory(self, path: str, recursive: bool = True) -> Iterator[Any]:
+        """
+        Yields the Files API entries under path, one directory level at a time.
+        Each level's directories are listed concurrently, overlapping the per-request round trips.
+        """
+        frontier = [path]
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        futures = []
         try:
-            for item in self.client.files.list_directory_contents(path):
-                if item.is_directory:
-                    mod_time = None
-                    if hasattr(item, 'modification_time'):
-                        mod_time = datetime.fromtimestamp(item.modification_time / 1000)
-                    elif hasattr(item, 'last_modified'):
-                        mod_time = datetime.fromtimestamp(item.last_modified / 1000)
-
-                    folder_size = self._calculate_folder_size(item.path)
-                    results.append(FileMetadata(
-                        path=item.path,
-                        type="directory",
-                        size_bytes=folder_size,
-                        last_modified=mod_time,
-                        source="databricks_volume",
-                        owner=self.owner
-                    ))
-                    
-                    if recursive:
-                        self._fetch_volume_files(item.path, results, recursive=True)
+            while frontier:
+                if len(frontier) > PARALLEL_LIST_THRESHOLD:
+                    futures = [pool.submit(self._list_directory, directory) for directory in frontier]
+                    listings = (future.result() for future in futures)
                 else:
-                    # modification_time might be missing or named differently
-                    mod_time = None
-                    if hasattr(item, 'modification_time'):
-                        mod_time = datetime.fromtimestamp(item.modification_time / 1000)
-                    elif hasattr(item, 'last_modified'): # common alternative
-                         # Validated: item.last_modified is int (epoch ms)
-                         mod_time = datetime.fromtimestamp(item.last_modified / 1000)
-                    
-                    results.append(FileMetadata(
-                        path=item.path, # e.g. /Volumes/main/default/myvol/file.txt
-                        type="file",
-                        size_bytes=item.file_size or 0,
-                        last_modified=mod_time,
-                        source="databricks_volume",
-                        owner=self.owner,
-                        etag=None,
-                        tags={}
-                    ))
-        except Exception as e:
-             print(f"Error scanning directory {path}: {e}")
+                    futures = []
+                    listings = map(self._list_directory, frontier)
+                next_level = []
+                for items in listings:
+                    for item in items:
+                        yield item
+                        if recursive and item.is_directory:
+                            next_level.append(item.path)
+                frontier = next_level
+        finally:
+            # A consumer that stops early does not wait for the level's remaining listings
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=False)
+
+    def _iter_volume_files(self, path: str, recursive: bool = True, compute_sizes: bool = True) -> Iterator[FileMetadata]:
+        """
+        Yields the entries under path and returns the total size of the tree.
+        The whole tree is walked once, even when not recursive, so directory sizes need no extra listing.
+        Without compute_sizes only the requested depth is walked; directory sizes and the total are None.
+        """
+        # Databricks SDK for Files API (Unity Catalog Volumes)
+        # client.files.list_directory_contents(path)
+        root = path.rstrip("/")
+        sizes = {root: 0}
+        directories = []
+        # Volume entries carry no tags; every row shares one empty mapping instead of allocating its own
+        shared_tags: Dict[str, str] = {}
+        for item in self._walk_directory(path, recursive or compute_sizes):
+            key = item.path.rstrip("/")
+            parent = posixpath.dirname(key)
+            if item.is_directory:
+                sizes[key] = 0
+                # Every directory is kept for folding sizes upwards; only the listed ones are yielded
+                directories.append((key, item if recursive or parent == root else None))
+                continue
+            sizes[parent] = sizes.get(parent, 0) + (item.file_size or 0)
+            if recursive or parent == root:
+                yield FileMetadata(
+                    path=item.path, # e.g. /Volumes/main/default/myvol/file.txt
+                    type="file",
+                    size_bytes=item.file_size or 0,
+                    last_modified=self._modification_time(item),
+                    source="databricks_volume",
+                    owner=self.owner,
+                    etag=None,
+                    tags=shared_tags
+                )
+
+        # The walk is breadth-first, so going backwards folds every directory into its parent after its children
+        for key, _ in reversed(directories):
+            parent = posixpath.dirname(key)
+            sizes[parent] = sizes.get(parent, 0) + sizes[key]
+
+        for key, item in directories:
+            if item is not None:
+                yield FileMetadata(
+                    path=item.path,
+                    type="directory",
+                    size_bytes=sizes[key] if compute_sizes else None,
+                    last_modified=self._modification_time(item),
+                    source="databricks_volume",
+                    owner=self.owner,
+                    tags=shared_tags
+                )
+        return sizes[root] if compute_sizes else None
+
+    def _modification_time(self, item: Any) -> datetime:
+        # modification_time might be missing or named differently; the entry type is fixed per SDK version, so probe once
+        attr = DatabricksConnector._mtime_attr
+        if attr is None:
+            attr = 'modification_time' if hasattr(item, 'modification_time') else 'last_modified' # common alternative
+            DatabricksConnector._mtime_attr = attr
+        # Validated: the value is int (epoch ms)
+        epoch_ms = getattr(item, attr, None)
+        return datetime.fromtimestamp(epoch_ms / 1000) if epoch_ms else None
 
     def list_volumes(self) -> List[Dict[str, str]]:
         """Lists all accessible volumes across all catalogs and schemas."""
         volumes = []
         try:
-            for catalog in self.client.catalogs.list():
+            catalogs = list(self.client.catalogs.list())
+            # Schemas of every catalog, then volumes of every schema, are each listed concurrently
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                schemas_by_catalog = list(pool.map(self._list_schemas, catalogs))
+                schema_pairs = [(catalog, schema) for catalog, schemas in zip(catalogs, schemas_by_catalog) for schema in schemas]
+                volumes_by_schema = iter(pool.map(lambda pair: self._list_schema_volumes(*pair), schema_pairs))
+
+            for catalog, schemas in zip(catalogs, schemas_by_catalog):
                 # Add catalog entry
                 volumes.append({
                     "type": "catalog",
@@ -186,36 +269,42 @@ class DatabricksConnector(BaseConnector):
                     "owner": getattr(catalog, 'owner', None)
                 })
                 
-                try:
-                    for schema in self.client.schemas.list(catalog.name):
-                        # Add schema entry
+                for schema in schemas:
+                    # Add schema entry
+                    volumes.append({
+                        "type": "schema",
+                        "name": schema.name,
+                        "catalog": catalog.name,
+                        "schema": schema.name,
+                        "owner": getattr(schema, 'owner', None)
+                    })
+                    
+                    for vol in next(volumes_by_schema):
                         volumes.append({
-                            "type": "schema",
-                            "name": schema.name,
+                            "type": "volume",
+                            "name": vol.name,
                             "catalog": catalog.name,
                             "schema": schema.name,
-                            "owner": getattr(schema, 'owner', None)
+                            "owner": getattr(vol, 'owner', None),
+                            "full_path": f"/Volumes/{catalog.name}/{schema.name}/{vol.name}"
                         })
-                        
-                        try:
-                            for vol in self.client.volumes.list(catalog.name, schema.name):
-                                volumes.append({
-                                    "type": "volume",
-                                    "name": vol.name,
-                                    "catalog": catalog.name,
-                                    "schema": schema.name,
-                                    "owner": getattr(vol, 'owner', None),
-                                    "full_path": f"/Volumes/{catalog.name}/{schema.name}/{vol.name}"
-                                })
-                        except Exception:
-                            continue
-                except Exception:
-                    continue
         except Exception as e:
             print(f"Error discovery volumes: {e}")
             
         return volumes
 
+    def _list_schemas(self, catalog: Any) -> List[Any]:
+        try:
+            return list(self.client.schemas.list(catalog.name))
+        except Exception:
+            return []
+
+    def _list_schema_volumes(self, catalog: Any, schema: Any) -> List[Any]:
+        try:
+            return list(self.client.volumes.list(catalog.name, schema.name))
+        except Exception:
+            return []
+
     def _list_dbfs(self, prefix: str) -> List[FileMetadata]:
         # Legacy DBFS support (kept for backward compatibility)
         path_to_list = prefix if prefix.startswith("dbfs:") else f"dbfs:{prefix}"
@@ -240,6 +329,18 @@ class DatabricksConnector(BaseConnector):
     def read_file(self, path: str) -> bytes:
         raise NotImplementedError("Databricks file reading is not yet implemented")
 
+    def _split_path(self, path: str) -> Tuple[Any, str]:
+        if path.startswith("/Volumes/"):
+            # /Volumes/<catalog>/<schema>/<volume>/<path>; missing levels match every volume below
+            parts = path[len("/Volumes/"):].split("/", 3)
+            names = [name or None for name in parts[:3]]
+            volume_key = tuple(names + [None] * (3 - len(names)))
+            return volume_key, parts[3] if len(parts) > 3 else ""
+        if path.startswith("dbfs:"):
+            return "dbfs", path
+        # A volume-relative path belongs to the configured volume
+        return (self.catalog, self.schema, self.volume), path
+
     def get_metadata(self, path: str) -> FileMetadata:
         raise NotImplementedError("Databricks metadata fetching is not yet implemented")
 
@@ -249,19 +350,6 @@ class DatabricksConnector(BaseConnector):
     def get_account_metadata(self) -> Dict[str, Any]:
         raise NotImplementedError("Databricks account metadata fetching is not yet implemented")
 
-    def _calculate_folder_size(self, path: str) -> int:
-        """Calculates total size of a folder by traversing its contents."""
-        total_size = 0
-        try:
-            for item in self.client.files.list_directory_contents(path):
-                if item.is_directory:
-                    total_size += self._calculate_folder_size(item.path)
-                else:
-                    total_size += item.file_size or 0
-        except Exception:
-            pass
-        return total_size
-
 class DatabricksConnectorBuilder:
     def __init__(self):
         self._config = {}
@@ -290,6 +378,14 @@ class DatabricksConnectorBuilder:
         self._config["databricks_owner"] = owner
         return self
 
+    def max_workers(self, max_workers: int):
+        self._config["databricks_max_workers"] = max_workers
+        return self
+
+    def list_cache_ttl(self, seconds: float):
+        self._config["list_cache_ttl"] = seconds
+        return self
+
     def build(self) -> DatabricksConnector:
         if not self._config.get("databricks_host") or not self._config.get("databricks_token"):
             raise ValueError("Databricks Host and Token are required.")
@@ -1,19 +1,71 @@
+import asyncio
 import boto3
+import functools
+import logging
 import os
-from typing import List, Dict, Any
-from .base import BaseConnector
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Iterator, Tuple
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from .base import BaseConnector, METADATA_BATCH_WORKERS, METADATA_PROBE_WORKERS, prefetch
 from ..models.metadata import FileMetadata
 
+logger = logging.getLogger(__name__)
+
+# Buckets scanned at once in discovery mode
+DISCOVERY_WORKERS = 16
+# Folder size scans in flight at once, across all listings of a connector
+FOLDER_SIZE_WORKERS = 16
+# Pooled keep-alive connections with adaptive retries for every client of a connector.
+# The pool has a connection for every thread that can be issuing requests at once, so none waits for one.
+CLIENT_CONFIG = Config(
+    max_pool_connections=DISCOVERY_WORKERS + FOLDER_SIZE_WORKERS + METADATA_BATCH_WORKERS + METADATA_PROBE_WORKERS,
+    retries={"max_attempts": 10, "mode": "adaptive"},
+    tcp_keepalive=True,
+    user_agent_extra="metadata_reader"
+)
+# Seconds a bucket's tags and region are reused before being fetched again
+BUCKET_INFO_TTL = 300
+# Keys per list_objects_v2 page (the service maximum)
+LIST_PAGE_SIZE = 1000
+# Listing pages fetched ahead of the one being processed
+PREFETCH_PAGES = 2
+# Error codes of a listing refused for FetchOwner; the listing is retried without it
+FETCH_OWNER_ERROR_CODES = ("AccessDenied", "NotImplemented", "InvalidArgument")
+
 class S3Connector(BaseConnector):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.bucket = config.get("bucket")
+        # Prefix stripped from paths passed to read_file/get_metadata
+        self._path_prefix = f"s3://{self.bucket}/"
         self.client = boto3.client(
             "s3",
             aws_access_key_id=config.get("aws_access_key_id"),
             aws_secret_access_key=config.get("aws_secret_access_key"),
-            region_name=config.get("region")
+            region_name=config.get("region"),
+            config=CLIENT_CONFIG
         )
+        # Read each object's ACL for its owner instead of using the bucket owner
+        self._per_object_acl = bool(config.get("per_object_acl"))
+        # (bucket, "tags" | "region" | "owner") -> (fetched at, value)
+        self._bucket_info: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        self._bucket_info_lock = threading.Lock()
+        # One pool sizes folders for every listing, so concurrent bucket scans share FOLDER_SIZE_WORKERS
+        self._folder_pool: ThreadPoolExecutor = None
+        self._folder_pool_lock = threading.Lock()
+        # Buckets where listing with FetchOwner failed; they are listed without it from then on
+        self._fetch_owner_unsupported: set = set()
+
+    def close(self):
+        """Stops the folder sizing and metadata worker threads; a later call starts them again."""
+        with self._folder_pool_lock:
+            pool, self._folder_pool = self._folder_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+        super().close()
 
     def list_buckets(self) -> List[str]:
         """Lists all buckets accessible to the credentials."""
@@ -21,114 +73,155 @@ class S3Connector(BaseConnector):
             response = self.client.list_buckets()
             return [b["Name"] for b in response.get("Buckets", [])]
         except Exception as e:
-            print(f"Error listing S3 buckets: {e}")
+            logger.error("Error listing S3 buckets: %s", e)
             return []
 
-    def list_objects(self, prefix: str = "", bucket: str = None, recursive: bool = True) -> List[FileMetadata]:
+    def list_objects(self, prefix: str = "", bucket: str = None, recursive: bool = True, compute_sizes: bool = True) -> List[FileMetadata]:
+        """
+        Lists objects under prefix; with recursive=False only the immediate children (keys and common prefixes).
+        With compute_sizes=False the common prefixes are not scanned for their size, which is left as None.
+        """
+        return self._cached_listing(
+            (bucket or self.bucket, prefix, recursive, compute_sizes),
+            lambda: list(self.iter_objects(prefix, bucket, recursive, compute_sizes=compute_sizes))
+        )
+
+    def iter_objects(self, prefix: str = "", bucket: str = None, recursive: bool = True,
+                     path_filter: Callable[[str], bool] = None, max_results: int = None, compute_sizes: bool = True) -> Iterator[FileMetadata]:
+        """
+        Yields the entries list_objects returns, one listing page at a time.
+        Only entries whose path passes path_filter are yielded; no further pages are requested once max_results have been yielded.
+        """
+        # Pages fetched ahead would be wasted requests once max_results is reached
+        prefetch_pages = 0 if max_results is not None else PREFETCH_PAGES
+        return self._limit_entries(self._iter_entries(prefix, bucket, recursive, compute_sizes, prefetch_pages), path_filter, max_results)
+
+    def _iter_entries(self, prefix: str, bucket: str, recursive: bool, compute_sizes: bool = True,
+                      prefetch_pages: int = PREFETCH_PAGES) -> Iterator[FileMetadata]:
         target_bucket = bucket or self.bucket
         
         # Discovery Mode: If no bucket is specified, scan all accessible buckets
         if not target_bucket:
-            print("🔍 Discovering accessible S3 Buckets...", file=os.sys.stderr)
+            logger.info("🔍 Discovering accessible S3 Buckets...")
             buckets = self.list_buckets()
-            print(f"Found {len(buckets)} buckets: {', '.join(buckets)}", file=os.sys.stderr)
+            logger.info("Found %d buckets: %s", len(buckets), ', '.join(buckets))
             
-            all_files = []
-            for b in buckets:
+            def scan_bucket(b: str) -> List[FileMetadata]:
                 try:
                     # Fetch bucket metadata (tags, region)
                     region = self.get_bucket_region(b)
-                    tags = self.get_bucket_tags(b)
+                    # A copy: the cached dict must not be reachable from the entries
+                    tags = dict(self.get_bucket_tags(b))
                     
                     # Fetch all objects in bucket
                     # Note: This recursive call will not re-enter discovery mode for sub-buckets
-                    bucket_items = self.list_objects(bucket=b, prefix=prefix, recursive=recursive)
-                    total_bucket_size = sum(item.size_bytes for item in bucket_items)
-
-                    # Add bucket entry itself
-                    all_files.append(FileMetadata(
-                        path=f"s3://{b}",
-                        type="bucket",
-                        size_bytes=total_bucket_size,
-                        last_modified=None,
-                        source="s3",
-                        owner=self._get_owner_from_tags(tags),
-                        tags=tags,
-                        extra_metadata={"region": region}
-                    ))
-                    all_files.extend(bucket_items)
+                    bucket_items = list(self._iter_entries(prefix, b, recursive, compute_sizes, prefetch_pages))
+                    total_bucket_size = sum(item.size_bytes or 0 for item in bucket_items)
                 except Exception as e:
-                    print(f" ❌ Error scanning bucket {b}: {e}", file=os.sys.stderr)
-            return all_files
+                    logger.warning(" ❌ Error scanning bucket %s: %s", b, e)
+                    return []
 
-        # Fetch Context Data (Tags, Permissions, Users)
-        bucket_tags = {}
-        try:
-            tag_resp = self.client.get_bucket_tagging(Bucket=target_bucket)
-            bucket_tags = {t["Key"].strip(): t["Value"] for t in tag_resp.get("TagSet", [])}
-        except Exception:
-            pass
+                # Add bucket entry itself
+                bucket_entry = FileMetadata(
+                    path=f"s3://{b}",
+                    type="bucket",
+                    size_bytes=total_bucket_size,
+                    last_modified=None,
+                    source="s3",
+                    owner=self._get_owner_from_tags(tags),
+                    tags=tags,
+                    extra_metadata={"region": region}
+                )
+                return [bucket_entry] + bucket_items
+
+            # Buckets are scanned concurrently and yielded in listing order
+            pool = ThreadPoolExecutor(max_workers=DISCOVERY_WORKERS)
+            futures = [pool.submit(scan_bucket, b) for b in buckets]
+            try:
+                for future in futures:
+                    yield from future.result()
+            finally:
+                # A consumer that stops early does not wait for the remaining scans
+                for future in futures:
+                    future.cancel()
+                pool.shutdown(wait=False)
+            return
 
+        # Fetch Context Data (Tags, Permissions, Users)
+        # One copy per listing, shared by its entries; the cached dict itself is never handed out
+        bucket_tags = dict(self.get_bucket_tags(target_bucket))
+        # Owner for objects listed without one
+        bucket_owner = self._get_owner_from_tags(bucket_tags)
 
         # Use Delimiter to avoid recursion if requested
         list_args = {
             "Bucket": target_bucket,
             "Prefix": prefix,
+            "MaxKeys": LIST_PAGE_SIZE,
             "FetchOwner": True
         }
         if not recursive:
             list_args["Delimiter"] = '/'
+        if prefix:
+            # Keys sort after their prefix, so this only leaves out a marker object named exactly like the prefix
+            list_args["StartAfter"] = prefix
 
-        try:
-            response = self.client.list_objects_v2(**list_args)
-        except Exception:
-            # Fallback if FetchOwner is not supported or permission denied
-            if "FetchOwner" in list_args:
-                del list_args["FetchOwner"]
-            response = self.client.list_objects_v2(**list_args)
-            
-        results = []
+        # The next pages are requested while the current one is turned into entries
+        for response in prefetch(self._iter_list_pages(list_args), prefetch_pages):
+            # Files
+            for obj in response.get("Contents", []):
+                owner_display = None
+                if "Owner" in obj:
+                    owner_display = obj["Owner"].get("DisplayName") or obj["Owner"].get("ID")
+                
+                if not owner_display:
+                    owner_display = bucket_owner
 
-        # Files
-        for obj in response.get("Contents", []):
-            # Skip the prefix itself if it appears in the results
-            if obj['Key'] == prefix:
-                continue
+                yield FileMetadata(
+                    path=f"s3://{target_bucket}/{obj['Key']}",
+                    type="file", 
+                    size_bytes=obj["Size"],
+                    owner=owner_display,
+                    last_modified=obj["LastModified"],
+                    last_accessed=None, 
+                    source="s3",
+                    tags=bucket_tags,
+                    etag=obj.get("ETag")
+                )
 
-            owner_display = None
-            if "Owner" in obj:
-                owner_display = obj["Owner"].get("DisplayName") or obj["Owner"].get("ID")
-            
-            if not owner_display:
-                owner_display = self._get_owner_from_tags(bucket_tags)
-
-            results.append(FileMetadata(
-                path=f"s3://{target_bucket}/{obj['Key']}",
-                type="file", 
-                size_bytes=obj["Size"],
-                owner=owner_display,
-                last_modified=obj["LastModified"],
-                last_accessed=None, 
-                source="s3",
-                tags=bucket_tags,
-                etag=obj.get("ETag")
-            ))
-
-        # Folders (CommonPrefixes)
-        for cp in response.get("CommonPrefixes", []):
-            folder_key = cp["Prefix"]
-            folder_size = self._calculate_folder_size(folder_key, target_bucket)
-            results.append(FileMetadata(
-                path=f"s3://{target_bucket}/{folder_key}",
-                type="directory",
-                size_bytes=folder_size,
-                owner=None, # Folders don't have explicit owners in S3 listings usually
-                last_modified=None,
-                source="s3",
-                tags=bucket_tags
-            ))
-
-        return results
+            # Folders (CommonPrefixes)
+            folder_keys = [cp["Prefix"] for cp in response.get("CommonPrefixes", [])]
+            folder_sizes = self._calculate_folder_sizes(folder_keys, target_bucket) if compute_sizes else [None] * len(folder_keys)
+            for folder_key, folder_size in zip(folder_keys, folder_sizes):
+                yield FileMetadata(
+                    path=f"s3://{target_bucket}/{folder_key}",
+                    type="directory",
+                    size_bytes=folder_size,
+                    owner=None, # Folders don't have explicit owners in S3 listings usually
+                    last_modified=None,
+                    source="s3",
+                    tags=bucket_tags
+                )
+
+    def _iter_list_pages(self, list_args: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yields list_objects_v2 responses, following continuation tokens until the listing is complete."""
+        if list_args["Bucket"] in self._fetch_owner_unsupported:
+            list_args = {k: v for k, v in list_args.items() if k != "FetchOwner"}
+        while True:
+            try:
+                response = self.client.list_objects_v2(**list_args)
+            except ClientError as e:
+                # Fallback if FetchOwner is not supported or permission denied; remembered per bucket.
+                # Other failures (throttling, connection errors) are raised and leave FetchOwner enabled.
+                if "FetchOwner" not in list_args or e.response.get("Error", {}).get("Code") not in FETCH_OWNER_ERROR_CODES:
+                    raise
+                list_args = {k: v for k, v in list_args.items() if k != "FetchOwner"}
+                response = self.client.list_objects_v2(**list_args)
+                self._fetch_owner_unsupported.add(list_args["Bucket"])
+            yield response
+            if not response.get("IsTruncated"):
+                return
+            list_args = dict(list_args, ContinuationToken=response["NextContinuationToken"])
 
     def read_file(self, path: str, bucket: str = None) -> bytes:
         # Parse bucket/key from path or assume it's just the key if prefix provided in init (but init takes bucket)
@@ -140,40 +233,70 @@ class S3Connector(BaseConnector):
 
     def get_metadata(self, path: str) -> FileMetadata:
         key = self._parse_path(path)
-        response = self.client.head_object(Bucket=self.bucket, Key=key)
-        
-        # Fetch Context Data
-        bucket_tags = {}
-        try:
-            tag_resp = self.client.get_bucket_tagging(Bucket=self.bucket)
-            bucket_tags = {t["Key"].strip(): t["Value"] for t in tag_resp.get("TagSet", [])}
-        except Exception:
-            pass
-            
 
-        # Try to get object tagging
-        tags = bucket_tags.copy()
+        # The lookups are independent requests: issue them together (boto3 clients are thread-safe)
+        head_future = self._probe(self.client.head_object, Bucket=self.bucket, Key=key)
+        bucket_tags_future = self._probe(self.get_bucket_tags, self.bucket)
+        object_tags_future = self._probe(self._get_object_tags, key)
+        owner_future = self._probe(self._get_object_owner, key)
+        response = head_future.result()
+
+        return self._build_file_metadata(key, response, bucket_tags_future.result(), object_tags_future.result(), owner_future.result())
+
+    def get_metadata_batch(self, paths: List[str]) -> List[FileMetadata]:
+        """
+        Fetches metadata for many objects of the configured bucket concurrently.
+        Bucket tags are looked up once; objects that cannot be read are reported and left out of the result.
+        """
+        bucket_tags = self.get_bucket_tags(self.bucket)
+
+        def fetch(path: str) -> FileMetadata:
+            key = self._parse_path(path)
+            try:
+                response = self.client.head_object(Bucket=self.bucket, Key=key)
+            except Exception as e:
+                logger.warning("Could not read metadata of s3://%s/%s: %s", self.bucket, key, e)
+                return None
+            return self._build_file_metadata(key, response, bucket_tags, self._get_object_tags(key), self._get_object_owner(key))
+
+        return self._map_batch(fetch, paths)
+
+    async def list_objects_async(self, prefix: str = "", bucket: str = None, recursive: bool = True, compute_sizes: bool = True) -> List[FileMetadata]:
+        """Awaitable list_objects, so several buckets or prefixes can be listed together with asyncio.gather."""
+        return await self._run_blocking(self.list_objects, prefix, bucket, recursive, compute_sizes)
+
+    async def read_file_async(self, path: str, bucket: str = None) -> bytes:
+        """Awaitable read_file."""
+        return await self._run_blocking(self.read_file, path, bucket)
+
+    async def get_metadata_async(self, path: str) -> FileMetadata:
+        """Awaitable get_metadata."""
+        return await self._run_blocking(self.get_metadata, path)
+
+    async def _run_blocking(self, fn: Callable[..., Any], *args: Any) -> Any:
+        # boto3 clients are thread-safe: the blocking call runs on the loop's default executor
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    def _get_object_tags(self, key: str) -> Dict[str, str]:
         try:
             tag_resp = self.client.get_object_tagging(Bucket=self.bucket, Key=key)
-            obj_tags = {t["Key"].strip(): t["Value"] for t in tag_resp.get("TagSet", [])}
-            tags.update(obj_tags) # Object tags override bucket tags if collision
+            return {t["Key"].strip(): t["Value"] for t in tag_resp.get("TagSet", [])}
         except Exception:
-            pass
+            return {}
+
+    def _get_object_owner(self, key: str) -> str:
+        if not self._per_object_acl:
+            # With object ACLs disabled (the S3 default) every object is owned by the bucket owner
+            return self._get_bucket_owner(self.bucket)
         # Try to get ACL for owner
-        owner_display = None
         try:
             acl_resp = self.client.get_object_acl(Bucket=self.bucket, Key=key)
-            owner_display = acl_resp["Owner"].get("DisplayName") or acl_resp["Owner"].get("ID")
+            return acl_resp["Owner"].get("DisplayName") or acl_resp["Owner"].get("ID")
         except Exception:
-            pass
-        # Fetch Object Tags
-        object_tags = {}
-        try:
-            obj_tag_resp = self.client.get_object_tagging(Bucket=self.bucket, Key=key)
-            object_tags = {t["Key"].strip(): t["Value"] for t in obj_tag_resp.get("TagSet", [])}
-        except Exception:
-            pass
-            
+            return None
+
+    def _build_file_metadata(self, key: str, response: Dict[str, Any], bucket_tags: Dict[str, str], object_tags: Dict[str, str], owner_display: str) -> FileMetadata:
+        # Object tags override bucket tags if collision
         final_tags = bucket_tags.copy()
         final_tags.update(object_tags)
 
@@ -213,21 +336,67 @@ class S3Connector(BaseConnector):
             return {"bucket": target_bucket}
 
     def get_bucket_region(self, bucket: str) -> str:
-        """Helper to get bucket region."""
+        """Helper to get bucket region (cached for BUCKET_INFO_TTL seconds)."""
+        return self._cached_bucket_info(bucket, "region", self._fetch_bucket_region)
+
+    def get_bucket_tags(self, bucket: str) -> Dict[str, str]:
+        """Helper to get bucket tags (cached for BUCKET_INFO_TTL seconds)."""
+        return self._cached_bucket_info(bucket, "tags", self._fetch_bucket_tags)
+
+    def _get_bucket_owner(self, bucket: str) -> str:
+        return self._cached_bucket_info(bucket, "owner", self._fetch_bucket_owner)
+
+    def _cached_bucket_info(self, bucket: str, kind: str, fetch: Callable[[str], Any]) -> Any:
+        key = (bucket, kind)
+        with self._bucket_info_lock:
+            cached = self._bucket_info.get(key)
+            if cached is not None and time.monotonic() - cached[0] < BUCKET_INFO_TTL:
+                return cached[1]
+        value = fetch(bucket)
+        with self._bucket_info_lock:
+            self._bucket_info[key] = (time.monotonic(), value)
+        return value
+
+    def refresh(self, bucket: str = None):
+        """Drops the cached tags, region and owner of bucket (of every bucket when None) so the next call fetches them again."""
+        with self._bucket_info_lock:
+            if bucket is None:
+                self._bucket_info.clear()
+                return
+            for key in [k for k in self._bucket_info if k[0] == bucket]:
+                del self._bucket_info[key]
+
+    def _fetch_bucket_region(self, bucket: str) -> str:
         try:
             loc_resp = self.client.get_bucket_location(Bucket=bucket)
             return loc_resp.get("LocationConstraint") or "us-east-1"
         except Exception:
             return "us-east-1"
 
-    def get_bucket_tags(self, bucket: str) -> Dict[str, str]:
-        """Helper to get bucket tags."""
+    def _fetch_bucket_owner(self, bucket: str) -> str:
+        try:
+            acl_resp = self.client.get_bucket_acl(Bucket=bucket)
+            return acl_resp["Owner"].get("DisplayName") or acl_resp["Owner"].get("ID")
+        except Exception:
+            return None
+
+    def _fetch_bucket_tags(self, bucket: str) -> Dict[str, str]:
         try:
             tag_resp = self.client.get_bucket_tagging(Bucket=bucket)
             return {t["Key"].strip(): t["Value"] for t in tag_resp.get("TagSet", [])}
         except Exception:
             return {}
 
+    def _calculate_folder_sizes(self, prefixes: List[str], bucket: str) -> List[int]:
+        """Sizes several folders concurrently; each is an independent listing."""
+        if len(prefixes) < 2:
+            return [self._calculate_folder_size(p, bucket) for p in prefixes]
+        with self._folder_pool_lock:
+            if self._folder_pool is None:
+                self._folder_pool = ThreadPoolExecutor(max_workers=FOLDER_SIZE_WORKERS)
+            pool = self._folder_pool
+        return list(pool.map(lambda p: self._calculate_folder_size(p, bucket), prefixes))
+
     def _calculate_folder_size(self, prefix: str, bucket: str = None) -> int:
         """Calculates total size of a folder by traversing its contents."""
         target_bucket = bucket or self.bucket
@@ -242,15 +411,20 @@ class S3Connector(BaseConnector):
         return total_size
 
 
-    def get_account_metadata(self) -> Dict[str, Any]:
-        """Returns metadata about the AWS Account (Caller)."""
-        sts = boto3.client(
+    @functools.cached_property
+    def sts_client(self) -> Any:
+        """STS client for the connector's credentials, built on first use."""
+        return boto3.client(
             "sts",
             aws_access_key_id=self.config.get("aws_access_key_id"),
             aws_secret_access_key=self.config.get("aws_secret_access_key"),
-            region_name=self.config.get("region")
+            region_name=self.config.get("region"),
+            config=CLIENT_CONFIG
         )
-        identity = sts.get_caller_identity()
+
+    def get_account_metadata(self) -> Dict[str, Any]:
+        """Returns metadata about the AWS Account (Caller)."""
+        identity = self.sts_client.get_caller_identity()
         return {
             "account_id": identity.get("Account"),
             "arn": identity.get("Arn"),
@@ -258,9 +432,16 @@ class S3Connector(BaseConnector):
             "source": "s3"
         }
 
+    def _split_path(self, path: str) -> Tuple[str, str]:
+        if path.startswith("s3://"):
+            bucket, _, key = path[len("s3://"):].partition("/")
+            return bucket, key
+        # A bare key belongs to the configured bucket
+        return self.bucket, path
+
     def _parse_path(self, path: str, bucket: str = None) -> str:
         target_bucket = bucket or self.bucket
-        prefix = f"s3://{target_bucket}/"
+        prefix = self._path_prefix if target_bucket == self.bucket else f"s3://{target_bucket}/"
         if path.startswith(prefix):
             return path[len(prefix):]
         return path
@@ -285,6 +466,14 @@ class S3ConnectorBuilder:
         self._config["bucket"] = bucket
         return self
 
+    def list_cache_ttl(self, seconds: float):
+        self._config["list_cache_ttl"] = seconds
+        return self
+
+    def per_object_acl(self, enabled: bool = True):
+        self._config["per_object_acl"] = enabled
+        return self
+
     def build(self) -> S3Connector:
         # Check for shared config or credentials
         if not self._config.get("aws_access_key_id") and not os.getenv("AWS_ACCESS_KEY_ID"):
@@ -1,10 +1,239 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Iterator, Optional
+from collections import deque
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 import requests
+import json
+import logging
 import os
+import threading
+import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from azure.identity import ClientSecretCredential
+try:
+    import ijson
+except ImportError:  # optional: stream-parse large Graph pages when installed
+    ijson = None
+try:
+    import orjson
+except ImportError:  # optional: faster decoding of buffered Graph responses when installed
+    orjson = None
 from .base import BaseConnector
 from ..models.metadata import FileMetadata
 
+logger = logging.getLogger(__name__)
+
+# Upper bound on concurrent Graph requests (kept below the HTTP pool size)
+MAX_FOLDER_WORKERS = 16
+
+GRAPH_ROOT = "https://graph.microsoft.com/v1.0"
+# Graph accepts at most 20 sub-requests per $batch call
+GRAPH_BATCH_LIMIT = 20
+# Sub-request statuses Graph uses for throttling inside a successful $batch response
+BATCH_RETRY_STATUSES = (429, 503)
+# Times a throttled sub-request is resent before the batch fails
+BATCH_MAX_RETRIES = 5
+# Seconds to wait before resending a throttled sub-request without Retry-After (doubled per attempt)
+BATCH_RETRY_BACKOFF = 1.0
+# Only request the driveItem fields we map, at Graph's maximum page size
+ITEM_QUERY = "$select=id,name,size,lastModifiedDateTime,createdBy,eTag,file,folder&$top=999"
+SIZE_QUERY = "$select=id,size,file,folder&$top=999"
+DELTA_QUERY = "$select=id,name,size,lastModifiedDateTime,createdBy,eTag,file,folder,parentReference,root,deleted&$top=999"
+# Pages with a known body smaller than this are cheaper to decode in one go
+STREAM_PARSE_THRESHOLD = 256 * 1024
+
+# Suggested location for the opt-in on-disk cache of {url: {"etag", "body"}} used to revalidate children pages across runs
+DEFAULT_ETAG_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "metadata_reader", "sp_etags.json")
+# Pages kept in the ETag cache; the least recently stored are evicted first
+ETAG_CACHE_MAX_ENTRIES = 2000
+
+# Shared read-only default for missing nested Graph objects
+_EMPTY: Dict[str, Any] = {}
+
+GRAPH_SCOPE = "https://graph.microsoft.com/.default"
+# Refresh the cached token this many seconds before it actually expires
+TOKEN_REFRESH_MARGIN = 60
+
+def _parse_iso(value: Optional[str]) -> Optional[datetime]:
+    """Parses a Graph ISO 8601 timestamp, returning None for missing or malformed values."""
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        # Graph returns UTC timestamps with a 'Z' suffix, which fromisoformat rejects before 3.11
+        if value.endswith("Z"):
+            return datetime.fromisoformat(value[:-1]).replace(tzinfo=timezone.utc)
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+def _json(resp: requests.Response) -> Any:
+    """Decodes a buffered Graph response body, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(resp.content)
+    return resp.json()
+
+def _sub_header(sub: Dict[str, Any], name: str) -> Optional[str]:
+    """Returns a header of a $batch sub-response; Graph does not normalise their case."""
+    name = name.lower()
+    for key, value in (sub.get("headers") or _EMPTY).items():
+        if key.lower() == name:
+            return value
+    return None
+
+def _retry_after(sub: Dict[str, Any], attempt: int) -> float:
+    """Seconds to wait before resending a throttled $batch sub-request: its Retry-After, else exponential backoff."""
+    try:
+        return float(_sub_header(sub, "Retry-After"))
+    except (TypeError, ValueError):
+        return BATCH_RETRY_BACKOFF * 2 ** attempt
+
+class _EtagCache:
+    """
+    Bounded {url: {"etag", "body"}} store of Graph pages for If-None-Match revalidation, kept in a JSON file between runs.
+    Only last pages are stored, so a replayed body never carries a stale @odata.nextLink. Safe to share between threads.
+    """
+    def __init__(self, path: str):
+        self._path = path
+        self._pages: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            with open(path) as f:
+                self._pages = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._pages.get(url)
+
+    def store(self, url: str, etag: Optional[str], body: Dict[str, Any]):
+        if not etag or "@odata.nextLink" in body:
+            return
+        with self._lock:
+            # Re-inserting moves the page to the young end for eviction
+            self._pages.pop(url, None)
+            self._pages[url] = {"etag": etag, "body": body}
+            while len(self._pages) > ETAG_CACHE_MAX_ENTRIES:
+                del self._pages[next(iter(self._pages))]
+            self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                os.makedirs(os.path.dirname(self._path), exist_ok=True)
+                tmp_path = self._path + ".tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(self._pages, f)
+                os.replace(tmp_path, self._path)
+                self._dirty = False
+            except OSError as e:
+                logger.warning("Could not write SharePoint ETag cache: %s", e)
+
+class GraphBatchRequester:
+    """
+    Coalesces Graph GET requests into $batch calls of up to 20 sub-requests.
+
+    Callbacks receive the parsed body of each successful sub-response and may
+    enqueue further requests; run() keeps flushing until the queue is empty.
+    Throttled sub-requests (429/503) are resent after their Retry-After; 404s
+    (items deleted mid-crawl) are reported and skipped; any other failure raises.
+    With an ETag cache, sub-requests for cached pages carry If-None-Match and a
+    304 hands the callback the cached body.
+    """
+    def __init__(self, session: requests.Session, get_headers: Callable[[], Dict[str, str]], max_workers: int = MAX_FOLDER_WORKERS,
+                 etag_cache: Optional[_EtagCache] = None):
+        self._session = session
+        # Called for every POST so long traversals pick up refreshed tokens
+        self._get_headers = get_headers
+        self._max_workers = max_workers
+        self._etag_cache = etag_cache
+        self._pending = deque()
+
+    def enqueue(self, url: str, callback: Callable[[Dict[str, Any]], None]):
+        # $batch sub-requests take URLs relative to the version root
+        if url.startswith(GRAPH_ROOT):
+            url = url[len(GRAPH_ROOT):]
+        self._pending.append((url, callback))
+
+    def _post_batch(self, entries: List[tuple]) -> List[Optional[Dict[str, Any]]]:
+        bodies = [None] * len(entries)
+        pending = list(range(len(entries)))
+        # Cached pages as of the first attempt; a 304 replays exactly the body whose ETag was sent
+        cached = {}
+        if self._etag_cache is not None:
+            for i, (url, _) in enumerate(entries):
+                page = self._etag_cache.get(GRAPH_ROOT + url)
+                if page:
+                    cached[i] = page
+        for attempt in range(BATCH_MAX_RETRIES + 1):
+            payload = {"requests": [self._sub_request(i, entries[i][0], cached.get(i)) for i in pending]}
+            # The session adapter already retries a throttled or failed $batch POST itself
+            resp = self._session.post(f"{GRAPH_ROOT}/$batch", headers=self._get_headers(), json=payload)
+            resp.raise_for_status()
+
+            statuses = {int(sub["id"]): sub for sub in _json(resp).get("responses", [])}
+            throttled = []
+            delay = 0.0
+            for i in pending:
+                sub = statuses.get(i)
+                status = sub.get("status") if sub else None
+                if status == 200:
+                    bodies[i] = sub.get("body") or {}
+                    if self._etag_cache is not None:
+                        self._etag_cache.store(GRAPH_ROOT + entries[i][0], _sub_header(sub, "ETag"), bodies[i])
+                elif status == 304 and i in cached:
+                    bodies[i] = cached[i]["body"]
+                elif status in BATCH_RETRY_STATUSES:
+                    throttled.append(i)
+                    delay = max(delay, _retry_after(sub, attempt))
+                elif status == 404:
+                    logger.warning("SharePoint item not found (deleted during the crawl?): %s", entries[i][0])
+                else:
+                    raise RuntimeError(f"Graph $batch sub-request {entries[i][0]} failed with status {status}")
+
+            if not throttled:
+                return bodies
+            if attempt < BATCH_MAX_RETRIES:
+                time.sleep(delay)
+            pending = throttled
+        raise RuntimeError(f"Graph kept throttling {len(pending)} $batch sub-request(s) after {BATCH_MAX_RETRIES} retries")
+
+    @staticmethod
+    def _sub_request(i: int, url: str, cached: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        request = {"id": str(i), "method": "GET", "url": url}
+        if cached:
+            request["headers"] = {"If-None-Match": cached["etag"]}
+        return request
+
+    def flush(self):
+        """Sends everything currently queued, several batches in flight at once."""
+        window = []
+        while self._pending and len(window) < GRAPH_BATCH_LIMIT * self._max_workers:
+            window.append(self._pending.popleft())
+        if not window:
+            return
+
+        chunks = [window[i:i + GRAPH_BATCH_LIMIT] for i in range(0, len(window), GRAPH_BATCH_LIMIT)]
+        if len(chunks) == 1:
+            responses = [self._post_batch(chunks[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=len(chunks)) as pool:
+                responses = list(pool.map(self._post_batch, chunks))
+
+        # Dispatch on the calling thread so callbacks need no locking
+        for chunk, bodies in zip(chunks, responses):
+            for (_, callback), body in zip(chunk, bodies):
+                if body is not None:
+                    callback(body)
+
+    def run(self):
+        while self._pending:
+            self.flush()
+
 class SharePointConnector(BaseConnector):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
@@ -23,6 +252,34 @@ class SharePointConnector(BaseConnector):
             client_id=self.client_id,
             client_secret=self.client_secret
         )
+        self._token = None
+        self._headers = None
+        self._token_lock = threading.Lock()
+
+        # Per-drive delta state so repeated scans only fetch what changed. Opt-in: it keeps every item of
+        # each crawled drive in memory; otherwise the item map only lives for one crawl.
+        self._incremental = bool(config.get("sharepoint_incremental"))
+        self._delta_links: Dict[str, str] = {}
+        self._drive_items: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # ETag revalidation is off unless a cache file is configured
+        self._etag_cache_path = config.get("sharepoint_etag_cache")
+        self._etag_cache: Optional[_EtagCache] = None
+
+        # Shared HTTP session so Graph calls reuse pooled keep-alive connections
+        self._session = requests.Session()
+        self._session.headers["User-Agent"] = "metadata-reader"
+        # $batch POSTs only wrap GETs, so they are safe to retry alongside plain GETs.
+        # This only covers the POST itself; GraphBatchRequester retries throttled sub-requests.
+        retries = Retry(total=5, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504],
+                        allowed_methods=["GET", "POST"])
+        self._session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=retries))
+
+
+        # Acquire the first token eagerly so auth problems surface at construction
+        try:
+            self._get_token()
+        except Exception as e:
+            raise RuntimeError(f"SharePoint auth failed: {e}") from e
         
         # Resolve Site ID if only URL is provided
         if not self.site_id and self.site_url:
@@ -42,10 +299,10 @@ class SharePointConnector(BaseConnector):
             token = self._get_token()
             headers = {"Authorization": f"Bearer {token}"}
             
-            resp = requests.get(api_url, headers=headers)
+            resp = self._session.get(api_url, headers=headers)
             
             if resp.status_code == 200:
-                data = resp.json()
+                data = _json(resp)
                 return data["id"]
             else:
                 print(f"Failed to resolve Site ID from URL: {resp.text}")
@@ -54,16 +311,20 @@ class SharePointConnector(BaseConnector):
             print(f"Error resolving Site ID: {e}")
             return None
 
+    def close(self):
+        """Closes the underlying HTTP session and its pooled connections."""
+        self._session.close()
+        super().close()
+
     def list_sites(self, search: str = "*") -> List[Dict[str, str]]:
         """Lists all accessible SharePoint sites."""
-        headers = self._get_headers()
         url = f"https://graph.microsoft.com/v1.0/sites?search={search}"
         sites = []
         try:
             while url:
-                resp = requests.get(url, headers=headers)
+                resp = self._session.get(url, headers=self._get_headers())
                 resp.raise_for_status()
-                data = resp.json()
+                data = _json(resp)
                 for site in data.get("value", []):
                     sites.append({
                         "id": site["id"],
@@ -76,19 +337,28 @@ class SharePointConnector(BaseConnector):
         return sites
 
     def _get_token(self) -> str:
-        token = self.credential.get_token("https://graph.microsoft.com/.default")
-        return token.token
+        """Returns a cached Graph token, refreshing it shortly before expiry."""
+        with self._token_lock:
+            token = self._token
+            if token is None or token.expires_on - TOKEN_REFRESH_MARGIN <= time.time():
+                token = self._token = self.credential.get_token(GRAPH_SCOPE)
+                self._headers = {
+                    "Authorization": f"Bearer {token.token}",
+                    "Content-Type": "application/json"
+                }
+            return token.token
 
     def _get_headers(self) -> Dict[str, str]:
-        return {
-            "Authorization": f"Bearer {self._get_token()}",
-            "Content-Type": "application/json"
-        }
+        """Request headers with a current token; fetched per request, since streamed crawls can outlive a token."""
+        self._get_token()
+        return self._headers
 
     def list_objects(self, prefix: str = "", site_id: str = None, drive_id: str = None) -> List[FileMetadata]:
-        headers = self._get_headers()
-        results = []
-        
+        return list(self.iter_objects(prefix=prefix, site_id=site_id, drive_id=drive_id))
+
+    def iter_objects(self, prefix: str = "", site_id: str = None, drive_id: str = None) -> Iterator[FileMetadata]:
+        """Yields metadata entries as they are fetched instead of building a full list."""
+
         target_site_id = site_id or self.site_id
         target_drive_id = drive_id or self.drive_id
 
@@ -99,11 +369,10 @@ class SharePointConnector(BaseConnector):
             sites = self.list_sites()
             print(f"Found {len(sites)} sites: {', '.join([s['name'] for s in sites])}", file=os.sys.stderr)
             
-            all_files = []
             for site in sites:
                 try:
                     # Add site entry itself
-                    all_files.append(FileMetadata(
+                    yield FileMetadata(
                         path=f"sharepoint://{site['id']}",
                         type="site",
                         size_bytes=0,
@@ -114,11 +383,11 @@ class SharePointConnector(BaseConnector):
                             "site_name": site["name"],
                             "web_url": site["webUrl"]
                         }
-                    ))
-                    all_files.extend(self.list_objects(prefix=prefix, site_id=site["id"], drive_id=drive_id))
+                    )
+                    yield from self.iter_objects(prefix=prefix, site_id=site["id"], drive_id=drive_id)
                 except Exception as e:
                     print(f"  ❌ Error scanning site {site['name']}: {e}", file=os.sys.stderr)
-            return all_files
+            return
 
         # If drive_id is not provided, list all drives (Document Libraries) and their children
         drives = []
@@ -127,57 +396,173 @@ class SharePointConnector(BaseConnector):
         else:
             # Fetch default drive or all drives
             url = f"https://graph.microsoft.com/v1.0/sites/{target_site_id}/drives"
-            resp = requests.get(url, headers=headers)
+            resp = self._session.get(url, headers=self._get_headers())
             resp.raise_for_status()
-            drives = resp.json().get("value", [])
+            drives = _json(resp).get("value", [])
 
         for drive in drives:
             d_id = drive["id"]
             
-            # Recursively list children
-            url = f"https://graph.microsoft.com/v1.0/sites/{target_site_id}/drives/{d_id}/root/children"
-            self._fetch_children(url, headers, target_site_id, d_id, results)
+            # One delta stream covers the whole drive; fall back to per-folder listing if unsupported
+            drive_items = self._crawl_drive(target_site_id, d_id)
+            if drive_items is not None:
+                yield from self._map_drive_items(drive_items, target_site_id, d_id)
+            else:
+                url = f"{GRAPH_ROOT}/sites/{target_site_id}/drives/{d_id}/root/children?{ITEM_QUERY}"
+                yield from self._fetch_children(url, target_site_id, d_id)
 
-        return results
+    def _crawl_drive(self, site_id: str, drive_id: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Fetches every item in a drive via the /delta endpoint, keyed by item id.
+        With incremental scans enabled, resumes from the stored delta link and item map. Returns None if delta is unavailable.
+        """
+        items = self._drive_items.get(drive_id, {}) if self._incremental else {}
+        url = (self._incremental and self._delta_links.get(drive_id)) or f"{GRAPH_ROOT}/sites/{site_id}/drives/{drive_id}/root/delta?{DELTA_QUERY}"
 
-    def _fetch_children(self, url: str, headers: Dict[str, str], site_id: str, drive_id: str, results: List[FileMetadata]):
         while url:
-            resp = requests.get(url, headers=headers)
-            if resp.status_code != 200:
-                break
+            links = {}
+            with self._session.get(url, headers=self._get_headers(), stream=True) as resp:
+                if resp.status_code != 200:
+                    # Expired delta tokens return 410; start over with a full crawl next time
+                    self._delta_links.pop(drive_id, None)
+                    self._drive_items.pop(drive_id, None)
+                    return None
+
+                for item in self._iter_page(resp, links):
+                    if "deleted" in item:
+                        items.pop(item["id"], None)
+                    else:
+                        items[item["id"]] = item
+
+            url = links.get("@odata.nextLink")
+            if not url and links.get("@odata.deltaLink") and self._incremental:
+                self._delta_links[drive_id] = links["@odata.deltaLink"]
+
+        if self._incremental:
+            self._drive_items[drive_id] = items
+        return items
+
+    def _iter_page(self, resp: requests.Response, links: Dict[str, str]) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the items of a Graph collection page and records its @odata.* links into `links`.
+        Large or chunked pages are stream-parsed with ijson when available instead of buffering the body.
+        """
+        length = int(resp.headers.get("Content-Length") or 0)
+        if ijson is None or 0 < length < STREAM_PARSE_THRESHOLD:
+            data = _json(resp)
+            links.update((k, v) for k, v in data.items() if k.startswith("@odata."))
+            yield from data.get("value", [])
+            return
+
+        resp.raw.decode_content = True
+        builder = None
+        for prefix, event, value in ijson.parse(resp.raw):
+            if builder is not None:
+                builder.event(event, value)
+                if prefix == "value.item" and event == "end_map":
+                    yield builder.value
+                    builder = None
+            elif prefix == "value.item" and event == "start_map":
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+            elif prefix.startswith("@odata.") and event == "string":
+                links[prefix] = value
+
+    def _map_drive_items(self, items: Dict[str, Dict[str, Any]], site_id: str, drive_id: str) -> Iterator[FileMetadata]:
+        """Yields the drive root's children, sizing folders by rolling file sizes up the parent chain."""
+        root_id = next((item_id for item_id, item in items.items() if "root" in item), None)
+        path_prefix = f"sharepoint://{site_id}/{drive_id}/"
+
+        def parent_of(item: Dict[str, Any]) -> Optional[str]:
+            return (item.get("parentReference") or {}).get("id")
+
+        folder_sizes = {item_id: 0 for item_id, item in items.items() if "folder" in item}
+        for item in items.values():
+            if "file" not in item:
+                continue
+            size = item.get("size", 0)
+            parent_id = parent_of(item)
+            while parent_id in folder_sizes and parent_id != root_id:
+                folder_sizes[parent_id] += size
+                parent_id = parent_of(items[parent_id])
+
+        for item_id, item in items.items():
+            if item_id == root_id or parent_of(item) != root_id:
+                continue
+            if "file" in item:
+                yield self._map_item_to_metadata(item, path_prefix)
+            elif "folder" in item:
+                yield self._map_item_to_metadata(item, path_prefix, folder_size_override=folder_sizes[item_id])
+
+    def _fetch_children(self, url: str, site_id: str, drive_id: str) -> Iterator[FileMetadata]:
+        path_prefix = f"sharepoint://{site_id}/{drive_id}/"
+        try:
+            while url:
+                data = self._cget(url)
+                items = data.get("value", [])
+
+                # Size all folders on this page in one batched traversal
+                folder_ids = [item['id'] for item in items if "folder" in item]
+                folder_sizes = self._calculate_folder_sizes(folder_ids, site_id, drive_id) if folder_ids else {}
                 
-            data = resp.json()
-            items = data.get("value", [])
-            
-            for item in items:
-                if "file" in item:
-                    results.append(self._map_item_to_metadata(item, site_id, drive_id))
-                elif "folder" in item:
-                    # Calculate folder size via traversal
-                    folder_size = self._calculate_folder_size(item['id'], headers, site_id, drive_id)
-                    results.append(self._map_item_to_metadata(item, site_id, drive_id, folder_size_override=folder_size))
-            
-            url = data.get("@odata.nextLink")
+                for item in items:
+                    if "file" in item:
+                        yield self._map_item_to_metadata(item, path_prefix)
+                    elif "folder" in item:
+                        yield self._map_item_to_metadata(item, path_prefix, folder_size_override=folder_sizes[item['id']])
+                
+                url = data.get("@odata.nextLink")
+        finally:
+            # Also keep what was revalidated when the caller stops early or a page fails
+            self._save_etag_cache()
+
+    def _cget(self, url: str) -> Dict[str, Any]:
+        """
+        GETs a Graph page, revalidating with If-None-Match against the ETag cache when one is configured.
+        Returns the parsed body (the cached one on 304) and raises if the request failed.
+        """
+        headers = self._get_headers()
+        cache = self._load_etag_cache()
+        if cache is None:
+            resp = self._session.get(url, headers=headers)
+            resp.raise_for_status()
+            return _json(resp)
+
+        cached = cache.get(url)
+        if cached:
+            headers = {**headers, "If-None-Match": cached["etag"]}
 
-    def _map_item_to_metadata(self, item: Dict[str, Any], site_id: str, drive_id: str, folder_size_override: int = None) -> FileMetadata:
+        resp = self._session.get(url, headers=headers)
+        if resp.status_code == 304 and cached:
+            return cached["body"]
+        resp.raise_for_status()
+
+        data = _json(resp)
+        cache.store(url, resp.headers.get("ETag"), data)
+        return data
+
+    def _load_etag_cache(self) -> Optional[_EtagCache]:
+        """The ETag cache, read from its file on first use; None unless one is configured."""
+        if self._etag_cache is None and self._etag_cache_path:
+            self._etag_cache = _EtagCache(self._etag_cache_path)
+        return self._etag_cache
+
+    def _save_etag_cache(self):
+        if self._etag_cache is not None:
+            self._etag_cache.save()
+
+    def _map_item_to_metadata(self, item: Dict[str, Any], path_prefix: str, folder_size_override: int = None) -> FileMetadata:
         # Map Graph API Item to FileMetadata
-        user = item.get("createdBy", {}).get("user", {}).get("displayName")
+        created_by = item.get("createdBy") or _EMPTY
+        user = (created_by.get("user") or _EMPTY).get("displayName")
+        is_folder = "folder" in item
         
-        # Parse date string to datetime object
-        last_modified = None
-        if item.get("lastModifiedDateTime"):
-            try:
-                from datetime import datetime
-                # Python 3.11+ handles ISO 8601 strings well, but Graph might return 'Z'
-                dt_str = item.get("lastModifiedDateTime").replace("Z", "+00:00")
-                last_modified = datetime.fromisoformat(dt_str)
-            except Exception:
-                pass
+        last_modified = _parse_iso(item.get("lastModifiedDateTime"))
 
         return FileMetadata(
-            path=f"sharepoint://{site_id}/{drive_id}/{item.get('name')}",
-            type="directory" if "folder" in item else "file",
-            size_bytes=folder_size_override if folder_size_override is not None else item.get("size", 0),
+            path=path_prefix + str(item.get('name')),
+            type="directory" if is_folder else "file",
+            size_bytes=item.get("size", 0) if folder_size_override is None else folder_size_override,
             last_modified=last_modified, 
             source="sharepoint",
             owner=user,
@@ -199,29 +584,38 @@ class SharePointConnector(BaseConnector):
     def get_account_metadata(self) -> Dict[str, Any]:
          return {"source": "sharepoint", "tenant_id": self.tenant_id}
 
-    def _calculate_folder_size(self, item_id: str, headers: Dict[str, str], site_id: str, drive_id: str) -> int:
+    def _calculate_folder_size(self, item_id: str, site_id: str, drive_id: str) -> int:
         """Calculates total size of a folder by traversing its contents."""
-        total_size = 0
-        url = f"https://graph.microsoft.com/v1.0/sites/{site_id}/drives/{drive_id}/items/{item_id}/children"
-        
-        while url:
-            try:
-                response = requests.get(url, headers=headers)
-                if response.status_code != 200:
-                    break
-                data = response.json()
-                items = data.get("value", [])
-                for item in items:
+        return self._calculate_folder_sizes([item_id], site_id, drive_id)[item_id]
+
+    def _calculate_folder_sizes(self, item_ids: List[str], site_id: str, drive_id: str) -> Dict[str, int]:
+        """Calculates total sizes of several folders with a breadth-first, $batch-coalesced traversal."""
+        totals = {item_id: 0 for item_id in item_ids}
+        # Subfolder pages are revalidated too, so an unchanged tree costs 304s rather than full pages
+        batcher = GraphBatchRequester(self._session, self._get_headers, etag_cache=self._load_etag_cache())
+
+        items_base = f"{GRAPH_ROOT}/sites/{site_id}/drives/{drive_id}/items/"
+        children_suffix = "/children?" + SIZE_QUERY
+
+        def children_url(item_id: str) -> str:
+            return items_base + item_id + children_suffix
+
+        def make_handler(root_id: str):
+            def handle_page(data: Dict[str, Any]):
+                for item in data.get("value", []):
                     if "file" in item:
-                        total_size += item.get("size", 0)
+                        totals[root_id] += item.get("size", 0)
                     elif "folder" in item:
-                        total_size += self._calculate_folder_size(item['id'], headers, site_id, drive_id)
-                
-                url = data.get("@odata.nextLink")
-            except Exception:
-                break
-            
-        return total_size
+                        batcher.enqueue(children_url(item['id']), handle_page)
+                next_link = data.get("@odata.nextLink")
+                if next_link:
+                    batcher.enqueue(next_link, handle_page)
+            return handle_page
+
+        for item_id in item_ids:
+            batcher.enqueue(children_url(item_id), make_handler(item_id))
+        batcher.run()
+        return totals
 
 class SharePointConnectorBuilder:
     def __init__(self):
@@ -251,6 +645,16 @@ class SharePointConnectorBuilder:
         self._config["sharepoint_drive_id"] = drive_id
         return self
 
+    def incremental(self, enabled: bool = True):
+        """Keeps each drive's delta link and item map between scans so later scans only fetch changes (memory grows with the drives crawled)."""
+        self._config["sharepoint_incremental"] = enabled
+        return self
+
+    def etag_cache(self, path: str = DEFAULT_ETAG_CACHE_PATH):
+        """Enables revalidation of children pages against an on-disk ETag cache (off by default); None disables it."""
+        self._config["sharepoint_etag_cache"] = path
+        return self
+
     def build(self) -> SharePointConnector:
         if not all([self._config.get("sharepoint_tenant_id"), 
                     self._config.get("sharepoint_client_id"), 
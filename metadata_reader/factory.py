@@ -1,6 +1,16 @@
-from typing import Dict, Any
+import importlib
+from typing import Dict, Any, Type
 from .connectors.base import BaseConnector
 
+# Source name -> (module, class); modules are imported on first use only
+_REGISTRY = {
+    "s3": (".connectors.s3", "S3Connector"),
+    "azure": (".connectors.azure", "AzureConnector"),
+    "databricks": (".connectors.databricks", "DatabricksConnector"),
+    "sharepoint": (".connectors.sharepoint", "SharePointConnector"),
+}
+_CACHE: Dict[str, Type[BaseConnector]] = {}
+
 def get_connector(source: str, config: Dict[str, Any]) -> BaseConnector:
     """
     Factory function to get the appropriate connector.
@@ -12,20 +22,14 @@ def get_connector(source: str, config: Dict[str, Any]) -> BaseConnector:
     Returns:
         An instance of a class inheriting from BaseConnector
     """
-    if source == "s3":
-        from .connectors.s3 import S3Connector
-        return S3Connector(config)
-    elif source == "azure":
-        from .connectors.azure import AzureConnector
-        return AzureConnector(config)
-    elif source == "databricks":
-        from .connectors.databricks import DatabricksConnector
-        return DatabricksConnector(config)
-    elif source == "sharepoint":
-        from .connectors.sharepoint import SharePointConnector
-        return SharePointConnector(config)
-    else:
-        raise ValueError(f"Unsupported source: {source}")
+    cls = _CACHE.get(source)
+    if cls is None:
+        if source not in _REGISTRY:
+            raise ValueError(f"Unsupported source: {source}. Expected one of: {', '.join(_REGISTRY)}")
+        module_name, class_name = _REGISTRY[source]
+        cls = getattr(importlib.import_module(module_name, __package__), class_name)
+        _CACHE[source] = cls
+    return cls(config)
 
 def azure_builder() -> Any:
     """Returns a new AzureConnectorBuilder instance."""
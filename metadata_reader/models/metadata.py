@@ -1,13 +1,17 @@
 import json
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, Dict, Any
 
-@dataclass
+# Listings create one instance per object, so drop the per-instance __dict__ where dataclasses support it (3.10+)
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_OPTIONS)
 class FileMetadata:
     path: str
     type: str  # 'file' or 'directory'
-    size_bytes: int
+    size_bytes: Optional[int]  # None when a listing skipped directory sizing
     last_modified: Optional[datetime]
     source: str
     owner: Optional[str] = None
@@ -1,11 +1,38 @@
+import importlib.util
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import MagicMock, patch
 from datetime import datetime
+from azure.core.exceptions import HttpResponseError
+from botocore.exceptions import ClientError
+from metadata_reader.connectors.base import prefetch
 from metadata_reader.connectors.s3 import S3Connector
-from metadata_reader.connectors.azure import AzureConnector
+from metadata_reader.connectors.azure import AzureConnector, _compile_glob, _extract_literal_prefix
 from metadata_reader.connectors.databricks import DatabricksConnector
+from metadata_reader.connectors.sharepoint import GraphBatchRequester, SharePointConnector, _EtagCache
+from metadata_reader.factory import get_connector
 from metadata_reader.models.metadata import FileMetadata
 
+def graph_response(body):
+    # Serve the body both ways _json may read it (orjson takes .content)
+    resp = MagicMock(status_code=200)
+    resp.json.return_value = body
+    resp.content = json.dumps(body).encode()
+    resp.headers = {"Content-Length": str(len(resp.content))}
+    resp.__enter__.return_value = resp
+    return resp
+
+def graph_batch_response(responses):
+    return graph_response({"responses": responses})
+
+def volume_entry(path, is_directory=False, file_size=None):
+    return MagicMock(path=path, is_directory=is_directory, file_size=file_size, modification_time=None)
+
 class TestConnectors(unittest.TestCase):
 
     @patch("boto3.client")
@@ -52,7 +79,7 @@ class TestConnectors(unittest.TestCase):
         mock_blob.last_modified = datetime(2023, 1, 2)
         mock_blob.last_accessed_on = datetime(2023, 1, 3)
         
-        mock_container_client.walk_blobs.return_value = [mock_blob]
+        mock_container_client.list_blobs.return_value = [mock_blob]
 
         config = {
             "connection_string": "DefaultEndpointsProtocol=https;AccountName=test;AccountKey=test;",
@@ -64,11 +91,12 @@ class TestConnectors(unittest.TestCase):
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0].path, "azure://test-container/test_blob.txt")
         self.assertEqual(results[0].size_bytes, 2048)
-        self.assertEqual(results[0].source, "blob_storage")
+        self.assertEqual(results[0].source, "azure")
         self.assertNotIn("access_control", results[0].extra_metadata)
 
+    @patch("metadata_reader.connectors.databricks.Config")
     @patch("metadata_reader.connectors.databricks.WorkspaceClient")
-    def test_databricks_connector(self, mock_ws_client):
+    def test_databricks_connector(self, mock_ws_client, mock_config):
         # Mock Databricks response
         mock_client = MagicMock()
         mock_ws_client.return_value = mock_client
@@ -92,3 +120,500 @@ class TestConnectors(unittest.TestCase):
         self.assertEqual(results[0].path, "dbfs:/test/file.txt")
         self.assertEqual(results[0].size_bytes, 512)
         self.assertEqual(results[0].source, "databricks_dbfs")
+        # Config is patched too: newer SDKs resolve the host over the network when it is built
+        self.assertEqual(mock_config.call_args[1]["host"], "https://test-databricks.com")
+        mock_ws_client.assert_called_once_with(config=mock_config.return_value)
+
+    @patch("metadata_reader.connectors.sharepoint.time.sleep")
+    def test_graph_batch_retries_throttled_subrequests(self, mock_sleep):
+        # Graph throttles inside a 200 $batch by failing single sub-requests
+        session = MagicMock()
+        session.post.side_effect = [
+            graph_batch_response([
+                {"id": "0", "status": 200, "body": {"value": ["a"]}},
+                {"id": "1", "status": 429, "headers": {"Retry-After": "7"}}
+            ]),
+            graph_batch_response([
+                {"id": "1", "status": 200, "body": {"value": ["b"]}}
+            ])
+        ]
+
+        bodies = []
+        batcher = GraphBatchRequester(session, lambda: {})
+        batcher.enqueue("/drives/d/items/1/children", bodies.append)
+        batcher.enqueue("/drives/d/items/2/children", bodies.append)
+        batcher.run()
+
+        self.assertEqual(bodies, [{"value": ["a"]}, {"value": ["b"]}])
+        mock_sleep.assert_called_once_with(7.0)
+        # Only the throttled sub-request is resent
+        resent = session.post.call_args_list[1][1]["json"]["requests"]
+        self.assertEqual([r["url"] for r in resent], ["/drives/d/items/2/children"])
+
+    def test_graph_batch_skips_missing_items_and_raises_on_failures(self):
+        session = MagicMock()
+        session.post.return_value = graph_batch_response([
+            {"id": "0", "status": 404},
+            {"id": "1", "status": 200, "body": {"value": []}}
+        ])
+
+        bodies = []
+        batcher = GraphBatchRequester(session, lambda: {})
+        batcher.enqueue("/drives/d/items/1/children", bodies.append)
+        batcher.enqueue("/drives/d/items/2/children", bodies.append)
+        batcher.run()
+        self.assertEqual(bodies, [{"value": []}])
+
+        session.post.return_value = graph_batch_response([{"id": "0", "status": 500}])
+        batcher.enqueue("/drives/d/items/3/children", bodies.append)
+        with self.assertRaises(RuntimeError):
+            batcher.run()
+
+    @patch("metadata_reader.connectors.sharepoint.ClientSecretCredential")
+    def test_sharepoint_delta_rolls_sizes_up_to_root_folders(self, mock_credential):
+        mock_credential.return_value.get_token.return_value = MagicMock(token="t", expires_on=time.time() + 3600)
+        connector = SharePointConnector({
+            "sharepoint_tenant_id": "tenant",
+            "sharepoint_client_id": "client",
+            "sharepoint_client_secret": "secret",
+            "sharepoint_incremental": True
+        })
+        connector._session = MagicMock()
+        connector._session.get.side_effect = [
+            graph_response({
+                "value": [
+                    {"id": "r", "root": {}, "folder": {}},
+                    {"id": "a", "name": "A", "folder": {}, "parentReference": {"id": "r"}},
+                    {"id": "b", "name": "B", "folder": {}, "parentReference": {"id": "a"}},
+                    {"id": "f1", "name": "f1", "file": {}, "size": 5, "parentReference": {"id": "b"}},
+                    {"id": "f2", "name": "f2", "file": {}, "size": 3, "parentReference": {"id": "a"}},
+                    {"id": "f3", "name": "f3", "file": {}, "size": 7, "parentReference": {"id": "r"}}
+                ],
+                "@odata.deltaLink": "delta-1"
+            }),
+            # The next scan resumes from the delta link and only sees what changed
+            graph_response({"value": [{"id": "f1", "deleted": {}}], "@odata.deltaLink": "delta-2"})
+        ]
+
+        def crawl():
+            items = connector._crawl_drive("s", "d")
+            return {m.path: m.size_bytes for m in connector._map_drive_items(items, "s", "d")}
+
+        self.assertEqual(crawl(), {"sharepoint://s/d/A": 8, "sharepoint://s/d/f3": 7})
+        self.assertEqual(crawl(), {"sharepoint://s/d/A": 3, "sharepoint://s/d/f3": 7})
+        self.assertEqual(connector._session.get.call_args_list[1][0][0], "delta-1")
+        self.assertEqual(connector._delta_links["d"], "delta-2")
+
+    @patch("azure.storage.blob.BlobServiceClient.from_connection_string")
+    def test_azure_aggregates_folder_sizes_in_one_listing(self, mock_service_client):
+        connector = AzureConnector({
+            "connection_string": "DefaultEndpointsProtocol=https;AccountName=test;AccountKey=test;",
+            "container": "test-container"
+        })
+        container_client = MagicMock()
+        blobs = []
+        for name, size in [("data/a/x", 1), ("data/a/b/y", 2), ("data/c/z", 4), ("data/top", 8)]:
+            blob = MagicMock(size=size)
+            blob.name = name
+            blobs.append(blob)
+        container_client.list_blobs.return_value = blobs
+
+        sizes = connector._aggregate_sizes_by_prefix(container_client, "data/")
+
+        self.assertEqual(sizes, {"data/a/": 3, "data/c/": 4})
+        container_client.list_blobs.assert_called_once_with(name_starts_with="data/")
+
+    @patch("metadata_reader.connectors.databricks.Config")
+    @patch("metadata_reader.connectors.databricks.WorkspaceClient")
+    def test_databricks_volume_folds_directory_sizes(self, mock_ws_client, mock_config):
+        listings = {
+            "/Volumes/c/s/v": [volume_entry("/Volumes/c/s/v/f1", file_size=1), volume_entry("/Volumes/c/s/v/d1", is_directory=True)],
+            "/Volumes/c/s/v/d1": [volume_entry("/Volumes/c/s/v/d1/f2", file_size=2), volume_entry("/Volumes/c/s/v/d1/d2", is_directory=True)],
+            "/Volumes/c/s/v/d1/d2": [volume_entry("/Volumes/c/s/v/d1/d2/f3", file_size=4)]
+        }
+        mock_ws_client.return_value.files.list_directory_contents.side_effect = lambda path: listings[path]
+        connector = DatabricksConnector({
+            "databricks_host": "https://test-databricks.com",
+            "databricks_token": "test-token"
+        })
+
+        entries = {m.path: m.size_bytes for m in connector._iter_volume_files("/Volumes/c/s/v")}
+        self.assertEqual(entries["/Volumes/c/s/v/d1"], 6)
+        self.assertEqual(entries["/Volumes/c/s/v/d1/d2"], 4)
+
+        # Not recursive: only the top level is yielded, but sizes still cover the whole tree
+        entries = {m.path: m.size_bytes for m in connector._iter_volume_files("/Volumes/c/s/v", recursive=False)}
+        self.assertEqual(entries, {"/Volumes/c/s/v/f1": 1, "/Volumes/c/s/v/d1": 6})
+
+    def test_prefetch_keeps_order_and_stops_the_source_when_closed(self):
+        self.assertEqual(list(prefetch(range(10), 2)), list(range(10)))
+
+        closed = threading.Event()
+        produced = []
+
+        def source():
+            try:
+                for i in range(1000):
+                    produced.append(i)
+                    yield i
+            finally:
+                closed.set()
+
+        values = prefetch(source(), 2)
+        self.assertEqual(next(values), 0)
+        values.close()
+        self.assertTrue(closed.wait(5))
+        self.assertLess(len(produced), 10)
+
+    def test_prefetch_raises_source_errors_in_the_consumer(self):
+        def source():
+            yield 1
+            raise ValueError("page failed")
+
+        values = prefetch(source(), 2)
+        self.assertEqual(next(values), 1)
+        with self.assertRaises(ValueError):
+            next(values)
+
+    @patch("boto3.client")
+    def test_list_cache_serves_repeats_until_invalidated(self, mock_boto):
+        mock_s3 = MagicMock()
+        mock_boto.return_value = mock_s3
+        mock_s3.list_objects_v2.return_value = {
+            "Contents": [{"Key": "data/file.txt", "Size": 1, "LastModified": datetime(2023, 1, 1)}]
+        }
+        connector = S3Connector({
+            "bucket": "test-bucket",
+            "aws_access_key_id": "test",
+            "aws_secret_access_key": "test",
+            "region": "us-east-1",
+            "list_cache_ttl": 60
+        })
+
+        connector.list_objects(prefix="data/")
+        listed = mock_s3.list_objects_v2.call_count
+        connector.list_objects(prefix="data/")
+        self.assertEqual(mock_s3.list_objects_v2.call_count, listed)
+
+        # Another bucket's path leaves the listing cached
+        connector.invalidate("s3://other-bucket/data/file.txt")
+        connector.list_objects(prefix="data/")
+        self.assertEqual(mock_s3.list_objects_v2.call_count, listed)
+
+        connector.invalidate("s3://test-bucket/data/file.txt")
+        results = connector.list_objects(prefix="data/")
+        self.assertEqual(mock_s3.list_objects_v2.call_count, 2 * listed)
+        self.assertEqual(results[0].path, "s3://test-bucket/data/file.txt")
+
+    def test_get_connector_rejects_unknown_sources(self):
+        with self.assertRaises(ValueError) as ctx:
+            get_connector("ftp", {})
+        self.assertIn("Unsupported source: ftp", str(ctx.exception))
+        self.assertIn("s3", str(ctx.exception))
+
+    def test_runner_stops_scanners_when_the_writer_fails(self):
+        spec = importlib.util.spec_from_file_location(
+            "run_metadata", os.path.join(os.path.dirname(__file__), "..", "usage_example", "run_metadata.py"))
+        runner = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(runner)
+
+        aborted = threading.Event()
+
+        def endless_scan(emit):
+            try:
+                while True:
+                    emit(MagicMock(to_dict=lambda: {}))
+            except runner.ScanAborted:
+                aborted.set()
+                raise
+
+        class BrokenStdout:
+            # The array's opening bracket goes through, the first entry hits a closed pipe
+            def __init__(self):
+                self.writes = 0
+
+            def write(self, text):
+                self.writes += 1
+                if self.writes > 1:
+                    raise BrokenPipeError()
+
+        errors = []
+
+        def run_main():
+            try:
+                runner.main()
+            except BaseException as e:
+                errors.append(e)
+
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch.dict(os.environ, {"AWS_ACCESS_KEY_ID": "test"}, clear=True), \
+                patch.object(runner, "scan_s3", endless_scan), \
+                patch.object(runner, "QUEUE_SIZE", 1), \
+                patch.object(runner.os, "getcwd", return_value=tmp), \
+                patch.object(runner.sys, "stdout", BrokenStdout()), \
+                patch.object(logging.getLogger("metadata_reader"), "handlers", []):
+            thread = threading.Thread(target=run_main, daemon=True)
+            thread.start()
+            thread.join(10)
+
+        self.assertFalse(thread.is_alive())
+        self.assertTrue(aborted.is_set())
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], BrokenPipeError)
+
+    @patch("boto3.client")
+    def test_s3_get_metadata_batch_keeps_order_and_skips_unreadable_objects(self, mock_boto):
+        mock_s3 = MagicMock()
+        mock_boto.return_value = mock_s3
+
+        def head_object(Bucket, Key):
+            if Key == "missing.txt":
+                raise Exception("404")
+            return {"ContentLength": len(Key), "LastModified": datetime(2023, 1, 1)}
+
+        mock_s3.head_object.side_effect = head_object
+        mock_s3.get_bucket_tagging.return_value = {"TagSet": [{"Key": "team", "Value": "data"}]}
+        mock_s3.get_object_tagging.return_value = {"TagSet": []}
+        mock_s3.get_bucket_acl.return_value = {"Owner": {"DisplayName": "bucket-owner"}}
+        connector = S3Connector({
+            "bucket": "test-bucket",
+            "aws_access_key_id": "test",
+            "aws_secret_access_key": "test",
+            "region": "us-east-1"
+        })
+
+        paths = ["s3://test-bucket/a.txt", "s3://test-bucket/missing.txt", "b/c.txt"]
+        results = connector.get_metadata_batch(paths)
+
+        self.assertEqual([r.path for r in results], ["s3://test-bucket/a.txt", "s3://test-bucket/b/c.txt"])
+        self.assertEqual([r.size_bytes for r in results], [5, 7])
+        self.assertEqual(results[0].tags, {"team": "data"})
+        # Bucket tags are looked up once for the whole batch
+        mock_s3.get_bucket_tagging.assert_called_once()
+
+    @patch("azure.storage.blob.BlobServiceClient.from_connection_string")
+    def test_azure_get_metadata_batch_keeps_order_and_skips_unreadable_blobs(self, mock_service_client):
+        mock_client = MagicMock()
+        mock_service_client.return_value = mock_client
+        mock_client.get_container_client.return_value.get_container_properties.return_value = MagicMock(metadata={"owner": "alice"})
+
+        def get_blob_client(container, blob):
+            blob_client = MagicMock()
+            if blob == "missing.txt":
+                blob_client.get_blob_properties.side_effect = Exception("BlobNotFound")
+            else:
+                blob_client.get_blob_properties.return_value = MagicMock(size=len(blob), metadata={}, etag="e")
+                blob_client.get_blob_tags.return_value = {}
+            return blob_client
+
+        mock_client.get_blob_client.side_effect = get_blob_client
+        connector = AzureConnector({
+            "connection_string": "DefaultEndpointsProtocol=https;AccountName=test;AccountKey=test;",
+            "container": "test-container"
+        })
+
+        paths = ["azure://test-container/a.txt", "azure://test-container/missing.txt", "b/c.txt"]
+        results = connector.get_metadata_batch(paths)
+
+        self.assertEqual([r.path for r in results], ["azure://test-container/a.txt", "b/c.txt"])
+        self.assertEqual([r.size_bytes for r in results], [5, 7])
+        self.assertEqual([r.owner for r in results], ["alice", "alice"])
+        # The container owner is resolved once for the whole batch
+        mock_client.get_container_client.return_value.get_container_properties.assert_called_once()
+
+    @patch("azure.storage.blob.BlobServiceClient.from_connection_string")
+    def test_azure_include_fallback_only_on_authorization_denial(self, mock_service_client):
+        mock_container_client = mock_service_client.return_value.get_container_client.return_value
+        connector = AzureConnector({
+            "connection_string": "DefaultEndpointsProtocol=https;AccountName=test;AccountKey=test;",
+            "container": "test-container"
+        })
+
+        # A transient error is raised straight away and does not narrow later listings
+        throttled = HttpResponseError(message="Server busy")
+        throttled.status_code = 503
+        mock_container_client.list_blobs.side_effect = throttled
+        with self.assertRaises(HttpResponseError):
+            connector.list_objects()
+        self.assertEqual(mock_container_client.list_blobs.call_count, 1)
+        self.assertEqual(connector._include_caps, {})
+
+        mock_blob = MagicMock(size=1, metadata=None, tags=None)
+        mock_blob.name = "test_blob.txt"
+        denied = HttpResponseError(message="This request is not authorized")
+        denied.status_code = 403
+        mock_container_client.list_blobs.side_effect = [denied, [mock_blob]]
+        results = connector.list_objects()
+
+        self.assertEqual([r.path for r in results], ["azure://test-container/test_blob.txt"])
+        self.assertNotIn("include", mock_container_client.list_blobs.call_args[1])
+        self.assertEqual(list(connector._include_caps.values()), [[]])
+
+    @patch("boto3.client")
+    def test_s3_fetch_owner_fallback_only_on_refusal(self, mock_boto):
+        mock_s3 = MagicMock()
+        mock_boto.return_value = mock_s3
+        page = {"Contents": [{"Key": "test_file.txt", "Size": 1, "LastModified": datetime(2023, 1, 1)}]}
+        config = {
+            "bucket": "test-bucket",
+            "aws_access_key_id": "test",
+            "aws_secret_access_key": "test",
+            "region": "us-east-1"
+        }
+
+        # Throttling is raised and leaves FetchOwner enabled for the bucket
+        connector = S3Connector(config)
+        mock_s3.list_objects_v2.side_effect = ClientError({"Error": {"Code": "SlowDown"}}, "ListObjectsV2")
+        with self.assertRaises(ClientError):
+            connector.list_objects()
+        self.assertEqual(connector._fetch_owner_unsupported, set())
+
+        mock_s3.list_objects_v2.side_effect = [ClientError({"Error": {"Code": "AccessDenied"}}, "ListObjectsV2"), page]
+        results = connector.list_objects()
+        self.assertEqual(len(results), 1)
+        self.assertNotIn("FetchOwner", mock_s3.list_objects_v2.call_args[1])
+        self.assertEqual(connector._fetch_owner_unsupported, {"test-bucket"})
+
+    @patch("boto3.client")
+    def test_s3_listing_tags_do_not_alias_the_bucket_cache(self, mock_boto):
+        mock_s3 = MagicMock()
+        mock_boto.return_value = mock_s3
+        mock_s3.get_bucket_tagging.return_value = {"TagSet": [{"Key": "team", "Value": "data"}]}
+        mock_s3.list_objects_v2.return_value = {
+            "Contents": [{"Key": "test_file.txt", "Size": 1, "LastModified": datetime(2023, 1, 1)}]
+        }
+        connector = S3Connector({
+            "bucket": "test-bucket",
+            "aws_access_key_id": "test",
+            "aws_secret_access_key": "test",
+            "region": "us-east-1"
+        })
+
+        connector.list_objects()[0].tags["team"] = "changed"
+
+        self.assertEqual(connector.list_objects()[0].tags, {"team": "data"})
+        self.assertEqual(connector.get_bucket_tags("test-bucket"), {"team": "data"})
+
+    @patch("metadata_reader.connectors.databricks.Config")
+    @patch("metadata_reader.connectors.databricks.WorkspaceClient")
+    def test_databricks_walk_stops_without_waiting_for_pending_listings(self, mock_ws_client, mock_config):
+        release = threading.Event()
+        directories = [volume_entry(f"/Volumes/c/s/v/d{i}", is_directory=True) for i in range(8)]
+
+        def list_directory_contents(path):
+            if path == "/Volumes/c/s/v":
+                return directories
+            # Every listing after the first is still in flight when the consumer stops
+            if path != "/Volumes/c/s/v/d0":
+                release.wait(5)
+            return [volume_entry(path + "/f", file_size=1)]
+
+        mock_ws_client.return_value.files.list_directory_contents.side_effect = list_directory_contents
+        connector = DatabricksConnector({
+            "databricks_host": "https://test-databricks.com",
+            "databricks_token": "test-token",
+            "databricks_max_workers": 2
+        })
+
+        walk = connector._walk_directory("/Volumes/c/s/v")
+        for item in walk:
+            if item.path == "/Volumes/c/s/v/d0/f":
+                break
+        started = time.monotonic()
+        walk.close()
+        self.assertLess(time.monotonic() - started, 1)
+        release.set()
+
+    def test_azure_glob_matching(self):
+        cases = [
+            # pattern, name, matches
+            ("data/*.csv", "data/a.csv", True),
+            ("data/*.csv", "data/sub/a.csv", False),
+            ("data/?.csv", "data/a.csv", True),
+            ("data/?.csv", "data//.csv", False),
+            ("data/**/a.csv", "data/a.csv", True),
+            ("data/**/a.csv", "data/x/y/a.csv", True),
+            ("data/**", "data/x/y/a.csv", True),
+            ("data/[!a]/f", "data/b/f", True),
+            ("data/[!a]/f", "data/a/f", False),
+            ("data[!a]f", "data/f", False),
+            ("[]]x", "]x", True),
+            ("[]]x", "ax", False),
+            ("[^x]", "^", True),
+            ("[^x]", "x", True),
+            ("[^x]", "y", False),
+            ("a^b", "a^b", True),
+            ("a{b,c}", "a{b,c}", True),
+            ("a[b", "a[b", True),
+        ]
+        for pattern, name, matches in cases:
+            with self.subTest(pattern=pattern, name=name):
+                self.assertEqual(_compile_glob(pattern).fullmatch(name) is not None, matches)
+
+    def test_azure_glob_literal_prefix_stops_at_the_first_wildcard(self):
+        cases = [
+            ("data/2023/*.csv", "data/2023/"),
+            ("data/file?.txt", "data/file"),
+            ("data/[ab]/x", "data/"),
+            ("data/**/x", "data/"),
+            ("data/{a,b}/x", "data/{a,b}/x"),
+            ("data/plain.txt", "data/plain.txt"),
+        ]
+        for pattern, prefix in cases:
+            with self.subTest(pattern=pattern):
+                self.assertEqual(_extract_literal_prefix(pattern), prefix)
+
+    @patch("azure.storage.blob.BlobServiceClient.from_connection_string")
+    def test_azure_read_file_assembles_chunks_written_out_of_order(self, mock_service_client):
+        content = bytes(range(256)) * 40
+
+        class FakeDownloader:
+            # Like the SDK's parallel download: each range is written at its offset, in whatever order it arrives
+            size = len(content)
+
+            def readinto(self, stream):
+                assert stream.writable() and stream.seekable()
+                chunk = 1000
+                offsets = list(range(0, len(content), chunk))
+                for offset in reversed(offsets):
+                    stream.seek(offset)
+                    stream.write(memoryview(content)[offset:offset + chunk])
+                stream.seek(0, 2)
+                return stream.tell()
+
+        mock_service_client.return_value.get_blob_client.return_value.download_blob.return_value = FakeDownloader()
+        connector = AzureConnector({
+            "connection_string": "DefaultEndpointsProtocol=https;AccountName=test;AccountKey=test;",
+            "container": "test-container"
+        })
+
+        self.assertEqual(connector.read_file("azure://test-container/blob.bin"), content)
+        mock_service_client.return_value.get_blob_client.assert_called_once_with(container="test-container", blob="blob.bin")
+
+    def test_graph_batch_replays_cached_pages_on_304(self):
+        url = "/drives/d/items/1/children"
+        page = {"value": [{"id": "f", "file": {}, "size": 3}]}
+        session = MagicMock()
+        session.post.side_effect = [
+            graph_batch_response([{"id": "0", "status": 200, "headers": {"ETag": "\"e1\""}, "body": page}]),
+            graph_batch_response([{"id": "0", "status": 304}])
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "etags.json")
+            cache = _EtagCache(path)
+            bodies = []
+            batcher = GraphBatchRequester(session, lambda: {}, etag_cache=cache)
+            batcher.enqueue(url, bodies.append)
+            batcher.run()
+            self.assertNotIn("headers", session.post.call_args[1]["json"]["requests"][0])
+            cache.save()
+
+            # A later run revalidates from the saved file and gets the same body back on 304
+            batcher = GraphBatchRequester(session, lambda: {}, etag_cache=_EtagCache(path))
+            batcher.enqueue(url, bodies.append)
+            batcher.run()
+
+        self.assertEqual(bodies, [page, page])
+        resent = session.post.call_args[1]["json"]["requests"][0]
+        self.assertEqual(resent["headers"], {"If-None-Match": "\"e1\""})
@@ -1,6 +1,10 @@
 import os
 import json
+import logging
 import sys
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # Try importing from the installed package
@@ -15,221 +19,335 @@ except ImportError:
     print("Error: 'metadata_reader' package not found. Please install it first.", file=sys.stderr)
     sys.exit(1)
 
+# orjson is optional; it encodes the metadata dicts several times faster
+try:
+    import orjson
+
+    def encode_item(item):
+        return orjson.dumps(item, default=str, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    def encode_item(item):
+        return json.dumps(item, indent=2, default=str)
+
 # Load environment variables from .env file
 load_dotenv()
 
+# Max entries buffered between the scanner threads and the JSON writer
+QUEUE_SIZE = 10000
+# Seconds a scanner waits on a full queue before checking whether the writer gave up
+PUT_TIMEOUT = 0.1
+
+class ScanAborted(BaseException):
+    """Raised in scanner threads once the writer has failed; a BaseException so the scanners' error handling lets it through."""
+
+class JsonArrayWriter:
+    """Streams a JSON array to several outputs one element at a time."""
+    def __init__(self, *streams):
+        self.streams = streams
+        self.first = True
+
+    def __enter__(self):
+        self._write("[")
+        return self
+
+    def write(self, item):
+        self._write(("\n" if self.first else ",\n") + encode_item(item))
+        self.first = False
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._write("]\n" if self.first else "\n]\n")
+
+    def _write(self, text):
+        for stream in self.streams:
+            stream.write(text)
+
+def summary_entry(source, location, count, status="Success"):
+    return {
+        "Source": source,
+        "Location": location,
+        "Files Found": count,
+        "Status": status
+    }
+
+def emit_all(items, emit):
+    """Passes each item to emit() and returns how many there were."""
+    count = 0
+    for item in items:
+        emit(item)
+        count += 1
+    return count
+
+def scan_s3(emit):
+    """Scans S3 buckets (explicit or discovered), passing each entry to emit()."""
+    summary = []
+
+    try:
+        s3_conn = s3_builder() \
+            .access_key_id(os.getenv("AWS_ACCESS_KEY_ID")) \
+            .secret_access_key(os.getenv("AWS_SECRET_ACCESS_KEY")) \
+            .region(os.getenv("AWS_REGION")) \
+            .build()
+
+        # Support discovery vs explicit buckets
+        config_buckets = os.getenv("S3_BUCKET")
+        if config_buckets:
+            buckets = [b.strip() for b in config_buckets.split(",") if b.strip()]
+            for bucket in buckets:
+                try:
+                    print(f"📦 Scanning S3 Bucket: {bucket}", file=sys.stderr)
+                    count = emit_all(s3_conn.iter_objects(bucket=bucket), emit)
+                    summary.append(summary_entry("AWS S3", bucket, count))
+                except Exception as e:
+                    print(f" ❌ Error scanning S3 bucket {bucket}: {e}", file=sys.stderr)
+                    summary.append(summary_entry("AWS S3", bucket, 0, f"Error: {str(e)[:50]}..."))
+        else:
+            # Discovery Mode
+            print("🔍 Using S3 Discovery Mode...", file=sys.stderr)
+            # Group results by bucket for the summary
+            bucket_counts = {}
+            for f in s3_conn.iter_objects():
+                emit(f)
+                b_name = f.path.split("/")[2] if f.path.startswith("s3://") else "Unknown"
+                bucket_counts[b_name] = bucket_counts.get(b_name, 0) + 1
+
+            for b_name, count in bucket_counts.items():
+                summary.append(summary_entry("AWS S3 (Discovery)", b_name, count))
+
+            if not bucket_counts:
+                summary.append(summary_entry("AWS S3 (Discovery)", "None Found", 0))
+
+    except Exception as e:
+        print(f" ❌ S3 Builder failed: {e}", file=sys.stderr)
+    return summary
+
+def scan_azure(emit):
+    """Scans Azure storage accounts and containers, passing each entry to emit()."""
+    summary = []
+
+    try:
+        # Build a base connector for discovery/shared config
+        az_discovery = azure_builder() \
+            .subscription_id(os.getenv("AZURE_SUBSCRIPTION_ID")) \
+            .client_id(os.getenv("AZURE_CLIENT_ID")) \
+            .client_secret(os.getenv("AZURE_CLIENT_SECRET")) \
+            .tenant_id(os.getenv("AZURE_TENANT_ID")) \
+            .connection_string(os.getenv("AZURE_CONNECTION_STRING")) \
+            .build()
+
+        # Determine accounts to scan
+        if os.getenv("AZURE_ACCOUNT_NAME"):
+            accounts = [a.strip() for a in os.getenv("AZURE_ACCOUNT_NAME").split(",") if a.strip()]
+        else:
+            print("🔍 Discovering Azure Storage Accounts...", file=sys.stderr)
+            accounts = az_discovery.list_storage_accounts()
+            print(f"Found {len(accounts)} accounts: {', '.join([a['name'] if isinstance(a, dict) else a for a in accounts])}", file=sys.stderr)
+
+        # Determine containers to scan
+        config_containers = [c.strip() for c in os.getenv("AZURE_CONTAINER", "").split(",") if c.strip()]
+
+        for acct in accounts:
+            try:
+                account_name = acct["name"] if isinstance(acct, dict) else acct
+                resource_group = acct["resource_group"] if isinstance(acct, dict) else None
+                account_tags = acct["tags"] if isinstance(acct, dict) else {}
+
+                az_conn = azure_builder() \
+                    .account_name(account_name) \
+                    .resource_group(resource_group) \
+                    .account_tags(account_tags) \
+                    .client_id(os.getenv("AZURE_CLIENT_ID")) \
+                    .client_secret(os.getenv("AZURE_CLIENT_SECRET")) \
+                    .tenant_id(os.getenv("AZURE_TENANT_ID")) \
+                    .build()
+
+                # Discover containers for this account if not specified
+                containers = config_containers if config_containers else az_conn.list_containers()
+
+                for container in containers:
+                    try:
+                        print(f"☁️  Scanning Azure Account: {account_name} | Container: {container}", file=sys.stderr)
+                        count = emit_all(az_conn.iter_objects(container=container), emit)
+                        summary.append(summary_entry("Azure Blob", f"{account_name}/{container}", count))
+                    except Exception as e:
+                        print(f" ❌ Error scanning Azure {account_name}/{container}: {e}", file=sys.stderr)
+                        summary.append(summary_entry("Azure Blob", f"{account_name}/{container}", 0, f"Error: {str(e)[:50]}..."))
+            except Exception as e:
+                print(f" ❌ Azure Builder failed for {acct if isinstance(acct, str) else acct.get('name')}: {e}", file=sys.stderr)
+    except Exception as e:
+        print(f" ❌ Azure Discovery failed: {e}", file=sys.stderr)
+    return summary
+
+def scan_sharepoint(emit):
+    """Scans the configured SharePoint site, passing each entry to emit()."""
+    summary = []
+
+    try:
+        site = os.getenv("SHAREPOINT_SITE_URL")
+        print(f"📂 Scanning SharePoint Site: {site}", file=sys.stderr)
+        sp = sharepoint_builder() \
+            .tenant_id(os.getenv("SHAREPOINT_TENANT_ID")) \
+            .client_id(os.getenv("SHAREPOINT_CLIENT_ID")) \
+            .client_secret(os.getenv("SHAREPOINT_CLIENT_SECRET")) \
+            .site_url(site) \
+            .build()
+        with sp:
+            count = emit_all(sp.iter_objects(), emit)
+        summary.append(summary_entry("SharePoint", site, count))
+    except Exception as e:
+        print(f" Error fetching SharePoint: {e}", file=sys.stderr)
+        summary.append(summary_entry("SharePoint", os.getenv("SHAREPOINT_SITE_URL"), 0, f"Error: {str(e)[:50]}..."))
+    return summary
+
+def scan_databricks(emit):
+    """Scans Databricks Unity Catalog volumes, passing each entry to emit()."""
+    summary = []
+
+    try:
+        # Build a base connector for discovery/shared config
+        db_discovery = databricks_builder() \
+            .host(os.getenv("DATABRICKS_HOST")) \
+            .token(os.getenv("DATABRICKS_TOKEN")) \
+            .build()
+
+        # Determine volumes to scan
+        config_volumes = os.getenv("DATABRICKS_VOLUME")
+        if config_volumes:
+            # Support comma-separated volumes
+            vols_to_scan = []
+            for v in config_volumes.split(","):
+                v = v.strip()
+                if not v: continue
+                # Check for catalog.schema.volume format
+                parts = v.split(".")
+                if len(parts) == 3:
+                    vols_to_scan.append({"catalog": parts[0], "schema": parts[1], "name": parts[2]})
+                else:
+                    vols_to_scan.append({
+                        "catalog": os.getenv("DATABRICKS_CATALOG"),
+                        "schema": os.getenv("DATABRICKS_SCHEMA"),
+                        "name": v
+                    })
+        else:
+            print("🔍 Discovering Databricks Volumes...", file=sys.stderr)
+            vols_to_scan = db_discovery.list_volumes()
+            print(f"Found {len(vols_to_scan)} accessible volumes", file=sys.stderr)
+
+        for vol_info in vols_to_scan:
+            catalog = vol_info.get("catalog")
+            schema = vol_info.get("schema")
+            vol_name = vol_info.get("name")
+            owner = vol_info.get("owner")
+
+            if not all([catalog, schema, vol_name]):
+                continue
+
+            try:
+                vol_path = f"{catalog}.{schema}.{vol_name}"
+                print(f"🧱 Scanning Databricks Volume: {vol_path}", file=sys.stderr)
+
+                db = databricks_builder() \
+                    .host(os.getenv("DATABRICKS_HOST")) \
+                    .token(os.getenv("DATABRICKS_TOKEN")) \
+                    .catalog(catalog) \
+                    .schema(schema) \
+                    .volume(vol_name) \
+                    .owner(owner) \
+                    .build()
+
+                count = emit_all(db.iter_objects(), emit)
+                summary.append(summary_entry("Databricks", vol_path, count))
+            except Exception as e:
+                vol_path = f"{catalog}.{schema}.{vol_name}" if vol_name else "Unknown"
+                print(f" ❌ Error scanning Databricks volume {vol_path}: {e}", file=sys.stderr)
+                summary.append(summary_entry("Databricks", vol_path, 0, f"Error: {str(e)[:50]}..."))
+    except Exception as e:
+        print(f" ❌ Databricks Discovery failed: {e}", file=sys.stderr)
+    return summary
+
 def main():
-    all_metadata = []
     summary = []
-    
-    # helper for summary
-    def add_to_summary(source, location, count, status="Success"):
-        summary.append({
-            "Source": source,
-            "Location": location,
-            "Files Found": count,
-            "Status": status
-        })
+
+    # Connector progress goes through logging; show it on stderr like the runner's own messages
+    log = logging.getLogger("metadata_reader")
+    log.setLevel(logging.INFO)
+    log.addHandler(logging.StreamHandler(sys.stderr))
 
     print("🚀 Starting MetaData Reader...", file=sys.stderr)
     print("="*40, file=sys.stderr)
-    
+
+    # Sources are independent, so scan them concurrently
+    scanners = []
     # 1. AWS S3
     if os.getenv("AWS_ACCESS_KEY_ID"):
-        try:
-            s3_conn = s3_builder() \
-                .access_key_id(os.getenv("AWS_ACCESS_KEY_ID")) \
-                .secret_access_key(os.getenv("AWS_SECRET_ACCESS_KEY")) \
-                .region(os.getenv("AWS_REGION")) \
-                .build()
-            
-            # Support discovery vs explicit buckets
-            config_buckets = os.getenv("S3_BUCKET")
-            if config_buckets:
-                buckets = [b.strip() for b in config_buckets.split(",") if b.strip()]
-                for bucket in buckets:
-                    try:
-                        print(f"📦 Scanning S3 Bucket: {bucket}", file=sys.stderr)
-                        files = s3_conn.list_objects(bucket=bucket)
-                        all_metadata.extend(files)
-                        add_to_summary("AWS S3", bucket, len(files))
-                    except Exception as e:
-                        print(f" ❌ Error scanning S3 bucket {bucket}: {e}", file=sys.stderr)
-                        add_to_summary("AWS S3", bucket, 0, f"Error: {str(e)[:50]}...")
-            else:
-                # Discovery Mode
-                print("🔍 Using S3 Discovery Mode...", file=sys.stderr)
-                files = s3_conn.list_objects()
-                all_metadata.extend(files)
-                # Group results by bucket for the summary
-                bucket_counts = {}
-                for f in files:
-                    b_name = f.path.split("/")[2] if f.path.startswith("s3://") else "Unknown"
-                    bucket_counts[b_name] = bucket_counts.get(b_name, 0) + 1
-                
-                for b_name, count in bucket_counts.items():
-                    add_to_summary("AWS S3 (Discovery)", b_name, count)
-                
-                if not files:
-                    add_to_summary("AWS S3 (Discovery)", "None Found", 0)
-
-        except Exception as e:
-            print(f" ❌ S3 Builder failed: {e}", file=sys.stderr)
-
+        scanners.append(scan_s3)
     # 2. Azure Blob Storage
     found_azure_creds = os.getenv("AZURE_SUBSCRIPTION_ID") or os.getenv("AZURE_ACCOUNT_NAME") or os.getenv("AZURE_CONNECTION_STRING")
     if found_azure_creds:
-        try:
-            # Build a base connector for discovery/shared config
-            az_discovery = azure_builder() \
-                .subscription_id(os.getenv("AZURE_SUBSCRIPTION_ID")) \
-                .client_id(os.getenv("AZURE_CLIENT_ID")) \
-                .client_secret(os.getenv("AZURE_CLIENT_SECRET")) \
-                .tenant_id(os.getenv("AZURE_TENANT_ID")) \
-                .connection_string(os.getenv("AZURE_CONNECTION_STRING")) \
-                .build()
-
-            # Determine accounts to scan
-            if os.getenv("AZURE_ACCOUNT_NAME"):
-                accounts = [a.strip() for a in os.getenv("AZURE_ACCOUNT_NAME").split(",") if a.strip()]
-            else:
-                print("🔍 Discovering Azure Storage Accounts...", file=sys.stderr)
-                accounts = az_discovery.list_storage_accounts()
-                print(f"Found {len(accounts)} accounts: {', '.join([a['name'] if isinstance(a, dict) else a for a in accounts])}", file=sys.stderr)
-
-            # Determine containers to scan
-            config_containers = [c.strip() for c in os.getenv("AZURE_CONTAINER", "").split(",") if c.strip()]
-            
-            for acct in accounts:
-                try:
-                    account_name = acct["name"] if isinstance(acct, dict) else acct
-                    resource_group = acct["resource_group"] if isinstance(acct, dict) else None
-                    account_tags = acct["tags"] if isinstance(acct, dict) else {}
-
-                    az_conn = azure_builder() \
-                        .account_name(account_name) \
-                        .resource_group(resource_group) \
-                        .account_tags(account_tags) \
-                        .client_id(os.getenv("AZURE_CLIENT_ID")) \
-                        .client_secret(os.getenv("AZURE_CLIENT_SECRET")) \
-                        .tenant_id(os.getenv("AZURE_TENANT_ID")) \
-                        .build()
-                        
-                    # Discover containers for this account if not specified
-                    containers = config_containers if config_containers else az_conn.list_containers()
-                    
-                    for container in containers:
-                        try:
-                            print(f"☁️  Scanning Azure Account: {account_name} | Container: {container}", file=sys.stderr)
-                            files = az_conn.list_objects(container=container)
-                            all_metadata.extend(files)
-                            add_to_summary("Azure Blob", f"{account_name}/{container}", len(files))
-                        except Exception as e:
-                            print(f" ❌ Error scanning Azure {account_name}/{container}: {e}", file=sys.stderr)
-                            add_to_summary("Azure Blob", f"{account_name}/{container}", 0, f"Error: {str(e)[:50]}...")
-                except Exception as e:
-                    print(f" ❌ Azure Builder failed for {acct if isinstance(acct, str) else acct.get('name')}: {e}", file=sys.stderr)
-        except Exception as e:
-            print(f" ❌ Azure Discovery failed: {e}", file=sys.stderr)
-
+        scanners.append(scan_azure)
     # 3. SharePoint
     if os.getenv("SHAREPOINT_CLIENT_ID"):
-        try:
-            site = os.getenv("SHAREPOINT_SITE_URL")
-            print(f"📂 Scanning SharePoint Site: {site}", file=sys.stderr)
-            sp = sharepoint_builder() \
-                .tenant_id(os.getenv("SHAREPOINT_TENANT_ID")) \
-                .client_id(os.getenv("SHAREPOINT_CLIENT_ID")) \
-                .client_secret(os.getenv("SHAREPOINT_CLIENT_SECRET")) \
-                .site_url(site) \
-                .build()
-            files = sp.list_objects()
-            all_metadata.extend(files)
-            add_to_summary("SharePoint", site, len(files))
-        except Exception as e:
-            print(f" Error fetching SharePoint: {e}", file=sys.stderr)
-            add_to_summary("SharePoint", os.getenv("SHAREPOINT_SITE_URL"), 0, f"Error: {str(e)[:50]}...")
-
+        scanners.append(scan_sharepoint)
     # 4. Databricks
     if os.getenv("DATABRICKS_HOST"):
+        scanners.append(scan_databricks)
+
+    # Scanners push entries through a bounded queue; the main thread writes them as they arrive
+    items = queue.Queue(maxsize=QUEUE_SIZE)
+    done = object()
+    # Set when the writer fails, so scanners blocked on a full queue stop instead of hanging the executor
+    stop = threading.Event()
+
+    def emit(item):
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=PUT_TIMEOUT)
+                return
+            except queue.Full:
+                pass
+        raise ScanAborted()
+
+    def run(scan):
         try:
-            # Build a base connector for discovery/shared config
-            db_discovery = databricks_builder() \
-                .host(os.getenv("DATABRICKS_HOST")) \
-                .token(os.getenv("DATABRICKS_TOKEN")) \
-                .build()
-
-            # Determine volumes to scan
-            config_volumes = os.getenv("DATABRICKS_VOLUME")
-            if config_volumes:
-                # Support comma-separated volumes
-                vols_to_scan = []
-                for v in config_volumes.split(","):
-                    v = v.strip()
-                    if not v: continue
-                    # Check for catalog.schema.volume format
-                    parts = v.split(".")
-                    if len(parts) == 3:
-                        vols_to_scan.append({"catalog": parts[0], "schema": parts[1], "name": parts[2]})
+            return scan(emit)
+        finally:
+            try:
+                emit(done)
+            except ScanAborted:
+                pass
+
+    output_path = os.path.join(os.getcwd(), "metadata_output.json")
+    with open(output_path, "w") as f, JsonArrayWriter(sys.stdout, f) as writer:
+        with ThreadPoolExecutor(max_workers=max(len(scanners), 1)) as executor:
+            futures = {executor.submit(run, scan): scan.__name__ for scan in scanners}
+            remaining = len(futures)
+            try:
+                while remaining:
+                    item = items.get()
+                    if item is done:
+                        remaining -= 1
                     else:
-                        vols_to_scan.append({
-                            "catalog": os.getenv("DATABRICKS_CATALOG"),
-                            "schema": os.getenv("DATABRICKS_SCHEMA"),
-                            "name": v
-                        })
-            else:
-                print("🔍 Discovering Databricks Volumes...", file=sys.stderr)
-                vols_to_scan = db_discovery.list_volumes()
-                print(f"Found {len(vols_to_scan)} accessible volumes", file=sys.stderr)
-
-            for vol_info in vols_to_scan:
-                catalog = vol_info.get("catalog")
-                schema = vol_info.get("schema")
-                vol_name = vol_info.get("name")
-                owner = vol_info.get("owner")
-                
-                if not all([catalog, schema, vol_name]):
-                    continue
+                        writer.write(item.to_dict())
+            except BaseException:
+                # e.g. a broken pipe or a full disk: release the scanners before the executor joins them
+                stop.set()
+                while True:
+                    try:
+                        items.get_nowait()
+                    except queue.Empty:
+                        break
+                raise
 
-                try:
-                    vol_path = f"{catalog}.{schema}.{vol_name}"
-                    print(f"🧱 Scanning Databricks Volume: {vol_path}", file=sys.stderr)
-                    
-                    db = databricks_builder() \
-                        .host(os.getenv("DATABRICKS_HOST")) \
-                        .token(os.getenv("DATABRICKS_TOKEN")) \
-                        .catalog(catalog) \
-                        .schema(schema) \
-                        .volume(vol_name) \
-                        .owner(owner) \
-                        .build()
-                        
-                    files = db.list_objects()
-                    all_metadata.extend(files)
-                    add_to_summary("Databricks", vol_path, len(files))
-                except Exception as e:
-                    vol_path = f"{catalog}.{schema}.{vol_name}" if vol_name else "Unknown"
-                    print(f" ❌ Error scanning Databricks volume {vol_path}: {e}", file=sys.stderr)
-                    add_to_summary("Databricks", vol_path, 0, f"Error: {str(e)[:50]}...")
+    for future, name in futures.items():
+        try:
+            summary.extend(future.result())
         except Exception as e:
-            print(f" ❌ Databricks Discovery failed: {e}", file=sys.stderr)
+            print(f" ❌ {name} failed: {e}", file=sys.stderr)
 
     print("\n" + "="*40, file=sys.stderr)
     print("📊 EXTRACTION SUMMARY:", file=sys.stderr)
     for s in summary:
         print(f" - {s['Source']} ({s['Location']}): {s['Files Found']} files [{s['Status']}]", file=sys.stderr)
     print("="*40 + "\n", file=sys.stderr)
-
-    # Output results as JSON
-    json_output = [item.to_dict() for item in all_metadata]
-    
-    # Print to console
-    print(json.dumps(json_output, indent=2, default=str))
-    
-    # Save to file
-    output_path = os.path.join(os.getcwd(), "metadata_output.json")
-    with open(output_path, "w") as f:
-        json.dump(json_output, f, indent=2, default=str)
     
     print(f"\n✅ Results saved to: {output_path}", file=sys.stderr)
 